@@ -1,136 +1,25 @@
+import os
+import sys
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import colors
-
-def bresenham_line(x0, y0, x1, y1):
-    """
-    Целочисленный алгоритм Брезенхема для рисования отрезка
-    """
-    points = []
-
-    dx = abs(x1 - x0)
-    dy = abs(y1 - y0)
-
-    x, y = x0, y0
-
-    x_step = 1 if x1 > x0 else -1
-    y_step = 1 if y1 > y0 else -1
-
-    points.append((x, y))
-
-    if dx > dy:
-        error = 2 * dy - dx
-        for i in range(dx):
-            if error >= 0:
-                y += y_step
-                error -= 2 * dx
-            x += x_step
-            error += 2 * dy
-            points.append((x, y))
-    else:
-        error = 2 * dx - dy
-        for i in range(dy):
-            if error >= 0:
-                x += x_step
-                error -= 2 * dy
-            y += y_step
-            error += 2 * dx
-            points.append((x, y))
-
-    return points
-
-def wu_line(x0, y0, x1, y1):
-    """
-    Алгоритм Ву для рисования сглаженного отрезка
-    """
-    points = []
-
-    def plot(x, y, intensity):
-        points.append((x, y, intensity))
-
-    steep = abs(y1 - y0) > abs(x1 - x0)
-
-    if steep:
-        x0, y0 = y0, x0
-        x1, y1 = y1, x1
-
-    if x0 > x1:
-        x0, x1 = x1, x0
-        y0, y1 = y1, y0
-
-    dx = x1 - x0
-    dy = y1 - y0
-
-    if dx == 0:
-        gradient = 1.0
-    else:
-        gradient = dy / dx
-
-    # первая конечная точка
-    xend = round(x0)
-    yend = y0 + gradient * (xend - x0)
-    xgap = 1 - (x0 + 0.5) % 1
-    xpxl1 = xend
-    ypxl1 = int(yend)
-
-    if steep:
-        plot(ypxl1, xpxl1, (1 - (yend % 1)) * xgap)
-        plot(ypxl1 + 1, xpxl1, (yend % 1) * xgap)
-    else:
-        plot(xpxl1, ypxl1, (1 - (yend % 1)) * xgap)
-        plot(xpxl1, ypxl1 + 1, (yend % 1) * xgap)
-
-    intery = yend + gradient
-
-    # вторая конечная точка
-    xend = round(x1)
-    yend = y1 + gradient * (xend - x1)
-    xgap = (x1 + 0.5) % 1
-    xpxl2 = xend
-    ypxl2 = int(yend)
-
-    if steep:
-        plot(ypxl2, xpxl2, (1 - (yend % 1)) * xgap)
-        plot(ypxl2 + 1, xpxl2, (yend % 1) * xgap)
-    else:
-        plot(xpxl2, ypxl2, (1 - (yend % 1)) * xgap)
-        plot(xpxl2, ypxl2 + 1, (yend % 1) * xgap)
-
-    # основная часть линии
-    for x in range(xpxl1 + 1, xpxl2):
-        if steep:
-            plot(int(intery), x, 1 - (intery % 1))
-            plot(int(intery) + 1, x, intery % 1)
-        else:
-            plot(x, int(intery), 1 - (intery % 1))
-            plot(x, int(intery) + 1, intery % 1)
-        intery += gradient
-
-    return points
-
-def create_canvas(width, height):
-    """Создает холст для рисования"""
-    return np.zeros((height, width))
-
-def draw_points(canvas, points, color=1.0):
-    """Рисует точки на холсте"""
-    for point in points:
-        if len(point) == 2:  # Для Брезенхема
-            x, y = point
-            if 0 <= x < canvas.shape[1] and 0 <= y < canvas.shape[0]:
-                canvas[y, x] = color
-        else:  # Для Ву (x, y, intensity)
-            x, y, intensity = point
-            if 0 <= x < canvas.shape[1] and 0 <= y < canvas.shape[0]:
-                canvas[y, x] = max(canvas[y, x], intensity)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from raster.lines import create_canvas, draw_points
+from raster.cache import RasterCache
+
+# Демонстрация рисует одни и те же отрезки много раз: точки берутся из кэша
+LINE_CACHE = RasterCache()
 
 def visualize_comparison(x0, y0, x1, y1, canvas_size=(100, 100)):
     """Визуализирует сравнение двух алгоритмов"""
+    import matplotlib.pyplot as plt
+
     fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(15, 5))
 
     # Алгоритм Брезенхема
     canvas_bresenham = create_canvas(canvas_size[0], canvas_size[1])
-    bresenham_points = bresenham_line(x0, y0, x1, y1)
+    bresenham_points = LINE_CACHE.line('bresenham', x0, y0, x1, y1)
     draw_points(canvas_bresenham, bresenham_points)
 
     ax1.imshow(canvas_bresenham, cmap='gray', interpolation='nearest')
@@ -141,7 +30,7 @@ def visualize_comparison(x0, y0, x1, y1, canvas_size=(100, 100)):
 
     # Алгоритм Ву
     canvas_wu = create_canvas(canvas_size[0], canvas_size[1])
-    wu_points = wu_line(x0, y0, x1, y1)
+    wu_points = LINE_CACHE.line('wu', x0, y0, x1, y1)
     draw_points(canvas_wu, wu_points)
 
     ax2.imshow(canvas_wu, cmap='gray', interpolation='nearest')
@@ -177,6 +66,8 @@ def visualize_comparison(x0, y0, x1, y1, canvas_size=(100, 100)):
 
 # Демонстрация работы алгоритмов
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     print("Демонстрация алгоритмов рисования отрезков")
     print("=" * 50)
 
@@ -210,7 +101,7 @@ if __name__ == "__main__":
         end_y = int(center_y + radius * np.sin(rad))
 
         canvas = create_canvas(100, 100)
-        points = wu_line(center_x, center_y, end_x, end_y)
+        points = LINE_CACHE.line('wu', center_x, center_y, end_x, end_y)
         draw_points(canvas, points)
 
         axes[i].imshow(canvas, cmap='gray', interpolation='nearest')
@@ -232,8 +123,8 @@ if __name__ == "__main__":
     canvas_bresenham = create_canvas(100, 100)
     canvas_wu = create_canvas(100, 100)
 
-    bresenham_points = bresenham_line(x0, y0, x1, y1)
-    wu_points = wu_line(x0, y0, x1, y1)
+    bresenham_points = LINE_CACHE.line('bresenham', x0, y0, x1, y1)
+    wu_points = LINE_CACHE.line('wu', x0, y0, x1, y1)
 
     draw_points(canvas_bresenham, bresenham_points)
     draw_points(canvas_wu, wu_points)
@@ -253,4 +144,8 @@ if __name__ == "__main__":
     plt.colorbar(im1, ax=ax1, fraction=0.046)
     plt.colorbar(im2, ax=ax2, fraction=0.046)
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+    stats = LINE_CACHE.stats()
+    print(f"\nКэш отрезков: попаданий {stats['hits']}, промахов {stats['misses']}, "
+          f"{stats['bytes']} байт")
\ No newline at end of file
@@ -1,17 +1,27 @@
-from PIL import Image
-import tkinter as tk
-from tkinter import filedialog
-from PIL import Image, ImageTk
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from raster.boundary import find_boundaries
+from raster.runs import RunMask
+from raster.buffer import ImageBuffer, PhotoView
 
 class FloodFillApp:
     def __init__(self, master):
+        import tkinter as tk
+
         self.master = master
         self.master.title("Border select")
         
         self.canvas = tk.Canvas(master, bg="white")
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.view = PhotoView(self.canvas)
         
+        self.buffer = None
         self.image = None
+        self.overlay = None
+        self.boundaries = None
 
         self.load_button = tk.Button(master, text="Load Image", command=self.load_image)
         self.load_button.pack()
@@ -19,84 +29,57 @@ class FloodFillApp:
         self.canvas.bind("<Button-1>", self.find_and_draw_boundary)
         
     def load_image(self):
+        from tkinter import filedialog
+
         file_path = filedialog.askopenfilename()
         if file_path:
-            self.image = Image.open(file_path).convert("RGBA")
-            self.display_image()
+            self.buffer = ImageBuffer.open(file_path, "RGBA")
+            self.image = self.buffer.image
+            # Границы рисуются на отдельном прозрачном слое, исходные пиксели не меняются
+            self.overlay = ImageBuffer.new("RGBA", self.image.size)
+            self.boundaries = None
+            self.display_image(full=True)
 
     def find_and_draw_boundary(self, event):
         if self.image is not None:
             x, y = event.x, event.y
-            target_color = self.image.getpixel((x, y))
-            boundary_points = self.find_boundary((x, y), target_color)
-            self.draw_boundary(boundary_points)
+            boundary = self.find_boundary((x, y))
+            self.draw_boundary(boundary)
             self.display_image()
 
-    def find_boundary(self, start_point, target_color):
-        width, height = self.image.size
-        visited = set()
-        boundary_points = []
-        direction = 0
-        current_point = start_point
-        x, y = current_point
-        
-        while self.image.getpixel((x, y)) == target_color:
-            x += 1
-            
-        current_point = (x, y)
-
-        while True:
-            x, y = current_point
-            if (x, y) in visited or x < 0 or x >= width or y < 0 or y >= height:
-                break
+    def find_boundary(self, start_point):
+        """Пиксели внешней границы области точки start_point как RunMask (отрезки строк)"""
+        x, y = start_point
+        shape = (self.image.height, self.image.width)
+        if y < 0 or y >= self.image.height or x < 0 or x >= self.image.width:
+            return RunMask(shape=shape)
+        # Границы всех областей считаются при первом щелчке, дальше - обращение к списку
+        if self.boundaries is None:
+            self.boundaries = find_boundaries(self.buffer.pixels)
+        labels, _, contours = self.boundaries
+        return RunMask.from_points(contours[labels[y, x]], shape)
 
-            visited.add((x, y))
-            current_color = self.image.getpixel((x, y))
-
-            boundary_points.append((x, y))
-
-            for i in range(8):
-                next_direction = (direction + i) % 8
-                neighbor = self.get_neighbor(current_point, next_direction)
-
-                neighbor_color = self.image.getpixel(neighbor)
-                if neighbor_color != target_color:
-                    current_point = neighbor
-                    direction = (direction + i - 2) % 8
-                    break
-
-        boundary_points.sort(key=lambda point: (point[1], point[0]))
-        return boundary_points
-
-    def get_neighbor(self, point, direction):
-        x, y = point
-        if direction == 0:
-            return (x, y + 1)
-        elif direction == 1:
-            return (x + 1, y + 1)
-        elif direction == 2:
-            return (x + 1, y)
-        elif direction == 3:
-            return (x + 1, y - 1)
-        elif direction == 4:
-            return (x, y - 1)
-        elif direction == 5:
-            return (x - 1, y - 1)
-        elif direction == 6:
-            return (x - 1, y)
-        elif direction == 7:
-            return (x - 1, y + 1)
-
-    def draw_boundary(self, boundary_points):
-        for point in boundary_points:
-            self.image.putpixel(point, (255, 0, 0))
-        return self.image
+    def draw_boundary(self, boundary):
+        if len(boundary):
+            boundary.fill(self.overlay.pixels, (255, 0, 0, 255))
+            self.overlay.mark(boundary.bounds())
+        return self.overlay.pixels
             
-    def display_image(self):
-        self.tk_image = ImageTk.PhotoImage(self.image)
-        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.tk_image)
+    def display_image(self, full=False):
+        from PIL import Image
+
+        box = self.overlay.take_dirty()
+        if full or self.view.photo is None:
+            self.view.show(Image.alpha_composite(self.image, self.overlay.image))
+        elif box is not None:
+            # Слой накладывается на изображение только в прямоугольнике новых границ
+            x0, y0, x1, y1 = box
+            crop = (x0, y0, x1 + 1, y1 + 1)
+            self.view.paste(Image.alpha_composite(self.image.crop(crop), self.overlay.image.crop(crop)), (x0, y0))
 
 if __name__ == "__main__":
+    import tkinter as tk
+
     root = tk.Tk()
     app = FloodFillApp(root)
     root.mainloop()
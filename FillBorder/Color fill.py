@@ -1,49 +1,78 @@
-from PIL import Image
+import os
+import sys
 
-def find_boundaries(image, x, y, target_color):
-    left = x
-    right = x
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-    while left > 0 and image.getpixel((left - 1, y)) == target_color:
-        left -= 1
+import numpy as np
 
-    while right < image.width - 1 and image.getpixel((right + 1, y)) == target_color:
-        right += 1
+from raster import fill
+from raster.buffer import ImageBuffer
+from raster.lines import open_canvas
+from raster.runs import RunMask
 
-    return left, right
+def image_buffer(image):
+    """
+    ImageBuffer для image: переданный ImageBuffer используется как есть, без копий,
+    а в изображение PIL изменения переносятся по прямоугольнику через sync()
+    """
+    return image if isinstance(image, ImageBuffer) else ImageBuffer(image, share=False)
 
-def flood_fill(image, x, y, target_color, replacement_color):
-    if y < 0 or y >= image.height or x < 0 or x >= image.width:
-        return
-    if image.getpixel((x, y)) != target_color:
-        return
-    if image.getpixel((x, y)) == replacement_color:
-        return
+def flood_fill(image, x, y, target_color, replacement_color, tolerance=0, connectivity=4, metric='channel'):
+    """
+    Заливает область точки (x, y) изображения PIL или ImageBuffer и возвращает ее как RunMask.
+    Если точка вне изображения, другого цвета или уже залита этим цветом, область пустая.
+    """
+    buffer = image_buffer(image)
+    pixels = buffer.pixels
+    region = fill.fill_region(pixels, x, y, target_color, tolerance, connectivity, metric)
+    if not len(region) or np.array_equal(pixels[y, x], np.asarray(replacement_color).reshape(-1)):
+        return RunMask(shape=region.shape)
+    region.fill(pixels, replacement_color)
+    buffer.mark(region.bounds())
+    buffer.sync()
+    return region
 
-    left, right = find_boundaries(image, x, y, target_color)
+def fill_regions(image, seeds, replacement_color, labels=None, tolerance=0, connectivity=4, metric='channel'):
+    """
+    Заливает области всех точек seeds [(x, y), ...] так же, как щелчки flood_fill по очереди.
+    При tolerance=0 карту меток можно посчитать один раз через label_regions и передавать при каждом вызове,
+    тогда каждая точка стоит одного обращения к массиву. Возвращает карту меток,
+    при tolerance > 0 - None (каждая точка заливается отдельно, см. raster.fill.fill_regions).
+    """
+    buffer = image_buffer(image)
+    labels = fill.fill_regions(buffer.pixels, seeds, replacement_color, labels, tolerance, connectivity, metric)
+    buffer.mark()
+    buffer.sync()
+    return labels
 
-    for j in range(left, right + 1):
-        image.putpixel((j, y), replacement_color)
-
-    if y > 0:
-        for j in range(left, right + 1):
-            flood_fill(image, j, y - 1, target_color, replacement_color)
-
-    if y < image.height - 1:
-        for j in range(left, right + 1):
-            flood_fill(image, j, y + 1, target_color, replacement_color)
+def flood_fill_file(path, width, height, channels, x, y, target_color, replacement_color, band=256,
+                    dtype='uint8', tolerance=0, connectivity=4, metric='channel'):
+    """
+    Заливка несжатого растра в файле (height, width, channels) по полосам из band строк.
+    В памяти одновременно одна полоса, поэтому так заливаются сканы, которые не помещаются в память.
+    """
+    pixels = open_canvas(path, width, height, channels, dtype)
+    changed = fill.flood_fill_banded(pixels, x, y, target_color, replacement_color, band,
+                                     tolerance, connectivity, metric)
+    pixels.flush()
+    return changed
 
 if __name__ == "__main__":
+    from PIL import Image
+
     image = Image.new("RGB", (5, 5), "white")
-    pixels = image.load()
+    buffer = image_buffer(image)
 
-    pixels[1, 1] = (0, 0, 0)
-    pixels[1, 2] = (0, 0, 0)
-    pixels[2, 1] = (0, 0, 255)
-    pixels[2, 3] = (0, 255, 0)
-    pixels[3, 1] = (0, 0, 0)
-    pixels[3, 2] = (0, 0, 0)
-    pixels[3, 3] = (0, 0, 0)
+    # Массив индексируется как [y, x]
+    buffer.pixels[1, 1] = (0, 0, 0)
+    buffer.pixels[2, 1] = (0, 0, 0)
+    buffer.pixels[1, 2] = (0, 0, 255)
+    buffer.pixels[3, 2] = (0, 255, 0)
+    buffer.pixels[1, 3] = (0, 0, 0)
+    buffer.pixels[2, 3] = (0, 0, 0)
+    buffer.pixels[3, 3] = (0, 0, 0)
+    buffer.mark()
+    buffer.sync()
 
     print("Исходное изображение:")
     image = Image.open('channels4_profile.jpg')
@@ -51,11 +80,11 @@ if __name__ == "__main__":
 
     target_color = (0, 0, 0)
 
-    pixels = image.load()
-    target_color = pixels[1, 1];    #Выбираем цвет конкретного пикселя
+    buffer = image_buffer(image)
+    target_color = buffer.pixels[1, 1].copy()    #Выбираем цвет конкретного пикселя
     
     replacement_color = (255, 0, 0)  # Красный цвет
-    flood_fill(image, 1, 1, target_color, replacement_color)
+    flood_fill(buffer, 1, 1, target_color, replacement_color, tolerance=32)
 
     print("\nИзображение после заливки:")
     image.show()
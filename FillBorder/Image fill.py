@@ -1,38 +1,64 @@
-from PIL import Image
+import os
+import sys
 
-import tkinter as tk
-from tkinter import filedialog
-from PIL import Image, ImageTk, ImageDraw
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import numpy as np
+
+from raster.fill import fill_pattern
+from raster.runs import RunMask
+from raster.buffer import ImageBuffer, PhotoView
 
 class FloodFillApp:
     def __init__(self, master):
+        import tkinter as tk
+        from PIL import ImageDraw
+
         self.master = master
         self.master.title("Flood Fill with Pattern")
         
         self.canvas = tk.Canvas(master, bg="white")
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.view = PhotoView(self.canvas)
 
         self.pattern = None
+        self.pattern_pixels = None
         self.start_x = None
         self.start_y = None
-        self.image = Image.new("RGBA", (1500, 1500), (255, 255, 255, 255))
+        # Линии ImageDraw и заливка пишут в одну и ту же память массива buffer.pixels
+        self.buffer = ImageBuffer.new("RGBA", (1500, 1500), (255, 255, 255, 255))
+        self.image = self.buffer.image
         self.draw = ImageDraw.Draw(self.image)
         self.drawing = False
+        # Залитые области в отрезках строк, по одной на каждую заливку
+        self.regions = []
 
         self.load_button = tk.Button(master, text="Load Image", command=self.load_image)
         self.load_button.pack()
+
+        self.tolerance = tk.IntVar(master, value=0)
+        self.tolerance_scale = tk.Scale(master, from_=0, to=255, orient=tk.HORIZONTAL,
+                                        label="Tolerance", variable=self.tolerance)
+        self.tolerance_scale.pack()
+
+        self.connectivity = tk.IntVar(master, value=4)
+        self.connectivity_button = tk.Checkbutton(master, text="8-connectivity", variable=self.connectivity,
+                                                  onvalue=8, offvalue=4)
+        self.connectivity_button.pack()
         
         self.canvas.bind("<Button-1>", self.start_drawing)
         self.canvas.bind("<B1-Motion>", self.draw_area)
         self.canvas.bind("<ButtonRelease-1>", self.end_drawing)
         self.canvas.bind("<Button-3>", self.flood_fill)
-
-        self.visited = [[False for _ in range(1500)] for _ in range(1500)]
         
     def load_image(self):
+        from tkinter import filedialog
+        from PIL import Image
+
         file_path = filedialog.askopenfilename()
         if file_path:
             self.pattern = Image.open(file_path).convert("RGBA")
+            self.pattern_pixels = np.asarray(self.pattern)
 
     def start_drawing(self, event):
         self.start_x = event.x
@@ -52,53 +78,35 @@ class FloodFillApp:
     def flood_fill(self, event):
         if self.pattern is not None:
             x, y = event.x, event.y
+            if y < 0 or y >= self.buffer.height or x < 0 or x >= self.buffer.width:
+                return
             self.start_x, self.start_y = event.x, event.y
-            target_color = self.image.getpixel((x, y))
-            self.flood_fill_algorithm(x, y, target_color)
+            target_color = self.buffer.pixels[y, x].copy()
+            region = self.flood_fill_algorithm(x, y, target_color)
+            if len(region):
+                self.regions.append(region)
+                self.buffer.mark(region.bounds())
             self.display_image()
-            self.visited = [[False for _ in range(1500)] for _ in range(1500)]
-
-    def find_boundaries(self, x, y, target_color):
-        left = x
-        right = x
-
-        while left > 0 and self.image.getpixel((left - 1, y)) == target_color:
-            left -= 1
-
-        while right < self.image.width - 1 and self.image.getpixel((right + 1, y)) == target_color:
-            right += 1
-
-        return left, right
 
     def flood_fill_algorithm(self, x, y, target_color):
-        if y < 0 or y >= self.image.height or x < 0 or x >= self.image.width:
-            return
-        if self.image.getpixel((x, y)) != target_color:
-            return
-        if self.visited[x][y]:
-            return
-
-        left, right = self.find_boundaries(x, y, target_color)
-
-        for j in range(left, right + 1):
-            pattern_x, pattern_y = j - self.start_x, y - self.start_y
-            pattern_x = pattern_x % self.pattern.width
-            pattern_y = pattern_y % self.pattern.height
-            self.image.putpixel((j, y), self.pattern.getpixel((pattern_x, pattern_y)))
-            self.visited[j][y] = True
-
-        if y > 0:
-            for j in range(left, right + 1):
-                self.flood_fill_algorithm(j, y - 1, target_color)
-        if y < self.image.height - 1:
-            for j in range(left, right + 1):
-                self.flood_fill_algorithm(j, y + 1, target_color)
+        """Заливает область узором и возвращает ее как RunMask"""
+        if y < 0 or y >= self.buffer.height or x < 0 or x >= self.buffer.width:
+            return RunMask(shape=self.buffer.pixels.shape[:2])
+
+        # Узор повторяется плиткой от точки щелчка
+        mask = fill_pattern(self.buffer.pixels, x, y, self.pattern_pixels, (self.start_x, self.start_y),
+                            target_color, self.tolerance.get(), self.connectivity.get())
+        return RunMask.from_mask(mask)
             
     def display_image(self):
-        self.tk_image = ImageTk.PhotoImage(self.image)
-        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.tk_image)
+        # На экран переносится только прямоугольник, измененный с прошлого показа
+        box = self.buffer.take_dirty()
+        if box is not None or self.view.photo is None:
+            self.view.show(self.image, box)
 
 if __name__ == "__main__":
+    import tkinter as tk
+
     root = tk.Tk()
     app = FloodFillApp(root)
     root.mainloop()
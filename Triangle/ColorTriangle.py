@@ -1,9 +1,19 @@
+import os
+import sys
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider, Button, TextBox
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from raster.triangle import shade_coverage
+from raster.cache import RasterCache
 
 class SimpleTriangleApp:
-    def __init__(self):
+    COLOR_UPDATE_DELAY = 30
+
+    def __init__(self, samples=None):
+        import matplotlib.pyplot as plt
+
         self.fig, (self.ax, self.ax_input) = plt.subplots(1, 2, figsize=(16, 8))
         plt.subplots_adjust(left=0.05, right=0.95, top=0.9, bottom=0.25)
     
@@ -14,8 +24,19 @@ class SimpleTriangleApp:
                                [0, 0, 255]]) 
         
         self.width, self.height = 500, 500
+        # Число подвыборок сглаживания ребер (4, 8 или 16), None - без сглаживания
+        self.samples = samples
+
+        # Веса пикселей по вершинам: при смене цвета и возврате к прежним вершинам растеризация не повторяется
+        self.cache = RasterCache()
+        # Смена цвета откладывается на COLOR_UPDATE_DELAY мс, чтобы склеить серию событий слайдеров
+        self.color_timer = self.fig.canvas.new_timer(interval=self.COLOR_UPDATE_DELAY)
+        self.color_timer.single_shot = True
+        self.color_timer.add_callback(self.flush_color_update)
+        self.color_update_pending = False
 
         self.setup_ui()
+        self.setup_plot()
         self.update_plot()
     
     def barycentric_coordinates(self, p, v1, v2, v3):
@@ -30,7 +51,14 @@ class SimpleTriangleApp:
         
         return l1, l2, l3
     
+    def triangle_coverage(self):
+        return self.cache.triangle_coverage(self.vertices, self.width, self.height, self.samples)
+
     def rasterize_triangle(self):
+        return shade_coverage(self.triangle_coverage(), self.colors, self.width, self.height)
+
+    def rasterize_triangle_reference(self):
+        # Попиксельный вариант, оставлен как эталон для сравнения с векторизованным
         image = np.zeros((self.height, self.width, 3), dtype=np.uint8)
         
         v1, v2, v3 = self.vertices
@@ -55,6 +83,9 @@ class SimpleTriangleApp:
         return image
     
     def setup_ui(self):
+        import matplotlib.pyplot as plt
+        from matplotlib.widgets import Slider, Button, TextBox
+
         self.text_boxes = []
         coord_labels = ['X1', 'Y1', 'X2', 'Y2', 'X3', 'Y3']
         initial_values = ['100', '100', '300', '150', '200', '350']
@@ -129,41 +160,60 @@ class SimpleTriangleApp:
         self.colors[0] = [self.slider_r1.val, self.slider_g1.val, self.slider_b1.val]
         self.colors[1] = [self.slider_r2.val, self.slider_g2.val, self.slider_b2.val]
         self.colors[2] = [self.slider_r3.val, self.slider_g3.val, self.slider_b3.val]
-        
-        self.update_plot()
-    
-    def update_plot(self):
-        self.ax.clear()
-        self.ax_input.clear()
-        
-        image = self.rasterize_triangle()
-        
-        self.ax.imshow(image, origin='lower', extent=[0, self.width, 0, self.height])
-        
-        for i, (vertex, color) in enumerate(zip(self.vertices, self.colors)):
-            self.ax.plot(vertex[0], vertex[1], 'o', markersize=10, 
-                        color=np.array(color)/255, markeredgecolor='black', markeredgewidth=2)
-            self.ax.text(vertex[0] + 15, vertex[1] + 15, f'V{i+1}', fontsize=12, 
-                        bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
-        
+
+        if not self.color_update_pending:
+            self.color_update_pending = True
+            self.color_timer.start()
+
+    def flush_color_update(self):
+        if self.color_update_pending:
+            self.color_update_pending = False
+            self.update_colors()
+
+    def setup_plot(self):
+        blank = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        self.image_artist = self.ax.imshow(blank, origin='lower', extent=[0, self.width, 0, self.height])
+
+        self.vertex_markers = []
+        self.vertex_labels = []
+        for i in range(3):
+            marker, = self.ax.plot([], [], 'o', markersize=10,
+                                   markeredgecolor='black', markeredgewidth=2)
+            label = self.ax.text(0, 0, f'V{i+1}', fontsize=12,
+                                 bbox=dict(boxstyle="round,pad=0.3", facecolor="white", alpha=0.8))
+            self.vertex_markers.append(marker)
+            self.vertex_labels.append(label)
+
         self.ax.set_xlim(0, self.width)
         self.ax.set_ylim(0, self.height)
         self.ax.set_aspect('equal')
         self.ax.grid(True, alpha=0.3)
-        
+
         self.ax_input.axis('off')
         info_text = (
            "X, Y ∈ [0, 500]\n"
             "RGB ∈ [0, 255]"
         )
-        
-        self.ax_input.text(0.05, -0.13, info_text, fontsize=11, va='top', 
+
+        self.ax_input.text(0.05, -0.13, info_text, fontsize=11, va='top',
                           bbox=dict(boxstyle="round,pad=0.8", facecolor="lightblue", alpha=0.7),
                           linespacing=1.5)
-        
+
+    def update_colors(self):
+        self.image_artist.set_data(self.rasterize_triangle())
+        for marker, color in zip(self.vertex_markers, self.colors):
+            marker.set_color(np.array(color)/255)
+            marker.set_markeredgecolor('black')
+
         self.fig.canvas.draw_idle()
-    
-    
+
+    def update_plot(self):
+        for marker, label, vertex in zip(self.vertex_markers, self.vertex_labels, self.vertices):
+            marker.set_data([vertex[0]], [vertex[1]])
+            label.set_position((vertex[0] + 15, vertex[1] + 15))
+
+        self.update_colors()
+
     def reset(self, event):
         self.vertices = np.array([[100, 100], [300, 150], [200, 350]], dtype=float)
         
@@ -181,13 +231,18 @@ class SimpleTriangleApp:
         self.slider_r3.set_val(0)
         self.slider_g3.set_val(0)
         self.slider_b3.set_val(255)
-        
+
+        self.color_timer.stop()
+        self.color_update_pending = False
         self.update_plot()
     
     def show(self):
+        import matplotlib.pyplot as plt
+
         plt.show()
 
 if __name__ == "__main__":
 
-    app = SimpleTriangleApp()
+    # Необязательный аргумент - число подвыборок сглаживания: python ColorTriangle.py 8
+    app = SimpleTriangleApp(int(sys.argv[1]) if len(sys.argv) > 1 else None)
     app.show()
\ No newline at end of file
@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from raster.triangle import rasterize_mesh, rasterize_mesh_tiled
+
+def random_mesh(count, width, height, max_size, seed=0):
+    """Случайный набор треугольников с цветами и глубиной"""
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(0, [width, height], (count, 1, 2))
+    vertices = centers + rng.uniform(-max_size / 2, max_size / 2, (count, 3, 2))
+    colors = rng.integers(0, 256, (count, 3, 3))
+    depth = rng.uniform(0, 1, (count, 3))
+    return vertices, colors, depth
+
+def measure(function, repeat):
+    """Лучшее время из repeat запусков"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Масштабирование плиточной растеризации по числу процессов")
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--triangles", type=int, default=200000)
+    parser.add_argument("--max-size", type=float, default=40)
+    parser.add_argument("--tile-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    vertices, colors, depth = random_mesh(args.triangles, args.width, args.height, args.max_size)
+
+    print(f"Кадр {args.width}x{args.height}, треугольников: {args.triangles}, плитка {args.tile_size}")
+    print("=" * 50)
+
+    base_time, (base_image, base_zbuffer) = measure(
+        lambda: rasterize_mesh(vertices, colors, args.width, args.height, depth=depth), args.repeat)
+    print(f"{'один процесс':>14}: {base_time:8.3f} с")
+
+    for workers in args.workers:
+        elapsed, (image, zbuffer) = measure(
+            lambda: rasterize_mesh_tiled(vertices, colors, args.width, args.height, depth=depth,
+                                         workers=workers, tile_size=args.tile_size), args.repeat)
+        identical = np.array_equal(image, base_image) and np.array_equal(zbuffer, base_zbuffer)
+        print(f"{workers:>3} процесс(ов): {elapsed:8.3f} с, ускорение {base_time / elapsed:5.2f}x, "
+              f"{'совпадает' if identical else 'ОТЛИЧАЕТСЯ'}")
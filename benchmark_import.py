@@ -0,0 +1,48 @@
+import argparse
+import subprocess
+import sys
+import time
+
+GUI_MODULES = ('matplotlib', 'tkinter', 'PIL')
+
+def cold_import(module, repeat):
+    """Лучшее время импорта module в свежем интерпретаторе из repeat запусков"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def loaded_gui_modules(module):
+    """Графические модули, которые подтягивает импорт module"""
+    code = (f"import sys, {module}\n"
+            f"print(' '.join(m for m in {GUI_MODULES!r} if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return output.stdout.split()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Время холодного импорта пакета raster")
+    parser.add_argument("--module", default="raster")
+    parser.add_argument("--budget", type=float, default=0.3, help="допустимое время импорта, с")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    interpreter = cold_import("sys", args.repeat)
+    numpy_time = cold_import("numpy", args.repeat)
+    module_time = cold_import(args.module, args.repeat)
+    gui = loaded_gui_modules(args.module)
+
+    print(f"{'интерпретатор':>14}: {interpreter:8.3f} с")
+    print(f"{'numpy':>14}: {numpy_time:8.3f} с")
+    print(f"{args.module:>14}: {module_time:8.3f} с (бюджет {args.budget:.3f} с)")
+
+    failed = False
+    if gui:
+        print(f"Импорт {args.module} подтягивает графические модули: {', '.join(gui)}")
+        failed = True
+    if module_time > args.budget:
+        print(f"Импорт {args.module} превышает бюджет")
+        failed = True
+    sys.exit(1 if failed else 0)
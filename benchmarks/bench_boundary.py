@@ -0,0 +1,22 @@
+import pytest
+
+from raster.boundary import trace_contour, find_boundaries
+
+from shapes import disc, spiral, maze, blocks
+
+@pytest.mark.parametrize("size", [100, 512, 2048, 4096])
+def test_trace_contour_disc(benchmark, size):
+    contour = benchmark(trace_contour, disc(size))
+    assert len(contour) > 0
+
+@pytest.mark.parametrize("shape", [spiral, maze])
+@pytest.mark.parametrize("size", [101, 257, 1025])
+def test_trace_contour_path(benchmark, shape, size):
+    # Граница коридора проходит вдоль всех стен
+    contour = benchmark(trace_contour, shape(size)[:, :, 0] == 255)
+    assert len(contour) > 0
+
+@pytest.mark.parametrize("size", [256, 1024, 2048])
+def test_find_boundaries(benchmark, size):
+    labels, edges, contours = benchmark(find_boundaries, blocks(size))
+    assert len(contours) == labels.max() + 1
@@ -0,0 +1,94 @@
+import pytest
+
+from raster.fill import flood_fill, flood_fill_banded, fill_region, fill_pattern, label_regions
+from raster.runs import RunMask
+from raster.buffer import ImageBuffer
+
+from shapes import blank, spiral, maze, blocks
+
+RED = (255, 0, 0)
+# Сплошная область на весь холст и области, где в каждой строке много отрезков
+AREA_CASES = [(blank, size) for size in (100, 512, 2048, 4096)]
+PATH_CASES = [(shape, size) for shape in (spiral, maze) for size in (101, 257, 1025)]
+CASES = AREA_CASES + PATH_CASES
+
+def case_id(case):
+    shape, size = case
+    return f"{shape.__name__}-{size}"
+
+@pytest.mark.parametrize("case", CASES, ids=case_id)
+def test_flood_fill(fresh, case):
+    shape, size = case
+    pixels = shape(size)
+    changed = fresh(flood_fill, pixels, 1, 1, tuple(pixels[1, 1]), RED)
+    assert changed
+
+@pytest.mark.parametrize("case", CASES, ids=case_id)
+def test_flood_fill_banded(fresh, case):
+    shape, size = case
+    pixels = shape(size)
+    changed = fresh(flood_fill_banded, pixels, 1, 1, tuple(pixels[1, 1]), RED, 256)
+    assert changed
+
+@pytest.mark.parametrize("case", CASES, ids=case_id)
+def test_fill_pattern(fresh, case):
+    # Ядро FloodFillApp.flood_fill_algorithm из Image fill.py
+    shape, size = case
+    pixels = shape(size)
+    pattern = blocks(64, block=4)
+    mask = fresh(fill_pattern, pixels, 1, 1, pattern)
+    assert mask[1, 1]
+
+@pytest.mark.parametrize("size", [256, 1024, 2048])
+def test_label_regions(benchmark, size):
+    labels = benchmark(label_regions, blocks(size))
+    assert labels.max() > 0
+
+@pytest.mark.parametrize("case", CASES, ids=case_id)
+def test_fill_region(benchmark, case):
+    shape, size = case
+    pixels = shape(size)
+    region = benchmark(fill_region, pixels, 1, 1)
+    assert region.contains(1, 1)
+
+@pytest.mark.parametrize("size", [256, 1024, 2048])
+def test_merge_regions(benchmark, size):
+    # Тысячи областей в отрезках строк и их объединение одной сортировкой
+    pixels = blocks(size)
+    seeds = [(x, y) for y in range(0, size, 32) for x in range(0, size, 32)]
+    regions = [fill_region(pixels, x, y) for x, y in seeds]
+    merged = benchmark(RunMask.merge, regions)
+    # Одна область может попасть в список несколько раз
+    assert all(merged.contains(x, y) for x, y in seeds)
+    assert merged.area() <= sum(region.area() for region in regions)
+
+@pytest.mark.parametrize("size", [256, 1024, 2048])
+@pytest.mark.parametrize("operation", ["union", "intersect", "difference", "to_mask"])
+def test_run_mask_operation(benchmark, operation, size):
+    first = RunMask.from_mask(blocks(size, seed=1)[..., 0] > 127)
+    second = RunMask.from_mask(blocks(size, seed=2)[..., 0] > 127)
+    if operation == "to_mask":
+        result = benchmark(first.to_mask)
+        assert result.sum() == first.area()
+    else:
+        result = benchmark(getattr(first, operation), second)
+        assert result.area() <= first.area() + second.area()
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA"])
+@pytest.mark.parametrize("size", [512, 2048])
+def test_fill_image_buffer(benchmark, mode, size):
+    # Заливка небольшой области изображения PIL: RGBA - общая память, RGB - перенос прямоугольника
+    from PIL import Image
+
+    buffer = ImageBuffer(Image.fromarray(blocks(size)).convert(mode), share=mode == "RGBA")
+    color = (255, 0, 0, 255)[:len(mode)]
+
+    def fill_and_sync():
+        region = fill_region(buffer.pixels, 1, 1)
+        region.fill(buffer.pixels, color)
+        buffer.mark(region.bounds())
+        buffer.sync()
+        return region
+
+    region = benchmark(fill_and_sync)
+    assert buffer.image.getpixel((1, 1)) == color and region.area() > 0
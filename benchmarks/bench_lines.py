@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from raster.lines import (bresenham_line, wu_line, bresenham_lines, wu_lines, wu_line_fixed, wu_lines_fixed,
+                          create_canvas, draw_points)
+from raster.path import polyline_coverage
+from raster.cache import RasterCache
+
+from shapes import segments, fan, trace
+
+LENGTHS = [100, 1000, 4000]
+SEGMENT_COUNTS = [100, 10000]
+CANVAS_SIZES = [100, 512, 2048, 4096]
+VERTEX_COUNTS = [1000, 100000]
+
+@pytest.mark.parametrize("length", LENGTHS)
+def test_bresenham_line(benchmark, length):
+    points = benchmark(bresenham_line, 0, 0, length, length // 3)
+    assert len(points) == length + 1
+
+@pytest.mark.parametrize("length", LENGTHS)
+def test_wu_line(benchmark, length):
+    points = benchmark(wu_line, 0, 0, length, length // 3)
+    assert len(points) == 2 * (length + 1)
+
+@pytest.mark.parametrize("length", LENGTHS)
+def test_wu_line_fixed(benchmark, length):
+    points = benchmark(wu_line_fixed, 0, 0, length, length // 3)
+    assert len(points) == 2 * (length + 1)
+
+@pytest.mark.parametrize("count", SEGMENT_COUNTS)
+def test_bresenham_lines(benchmark, count):
+    xs, ys = benchmark(bresenham_lines, segments(count, 512))
+    assert len(xs) == len(ys) >= count
+
+@pytest.mark.parametrize("count", SEGMENT_COUNTS)
+def test_wu_lines(benchmark, count):
+    xs, ys, intensity = benchmark(wu_lines, segments(count, 512))
+    assert len(xs) == len(intensity) >= count
+
+@pytest.mark.parametrize("count", SEGMENT_COUNTS)
+def test_wu_lines_fixed(benchmark, count):
+    xs, ys, coverage = benchmark(wu_lines_fixed, segments(count, 512))
+    assert len(xs) == len(coverage) >= count
+
+@pytest.mark.parametrize("size", CANVAS_SIZES)
+def test_draw_points_bresenham(benchmark, size):
+    points = np.concatenate([bresenham_line(*segment) for segment in fan(size)])
+    canvas = create_canvas(size, size)
+    benchmark(draw_points, canvas, points)
+    assert canvas.max() == 1
+
+@pytest.mark.parametrize("size", CANVAS_SIZES)
+def test_draw_points_wu(benchmark, size):
+    points = np.concatenate([wu_line(*segment) for segment in fan(size)])
+    canvas = create_canvas(size, size)
+    benchmark(draw_points, canvas, points)
+    assert canvas.max() > 0
+
+@pytest.mark.parametrize("count", VERTEX_COUNTS)
+@pytest.mark.parametrize("join", ["miter", "round"])
+def test_polyline_coverage(benchmark, count, join):
+    xs, ys, coverage = benchmark(polyline_coverage, trace(count, 1024), 1024, 1024, 3.0, join, 'round')
+    assert len(xs) == len(coverage) > 0 and coverage.max() == 1
+
+@pytest.mark.parametrize("count", VERTEX_COUNTS)
+def test_polyline_coverage_dashed(benchmark, count):
+    xs, ys, coverage = benchmark(polyline_coverage, trace(count, 1024), 1024, 1024, 2.0, dash=[8, 4])
+    assert len(xs) == len(coverage) > 0
+
+@pytest.mark.parametrize("length", LENGTHS)
+def test_cached_wu_line(benchmark, length):
+    # Повторная отрисовка того же отрезка: точки берутся из кэша
+    cache = RasterCache()
+    cache.line('wu', 0, 0, length, length // 3)
+    points = benchmark(cache.line, 'wu', 0, 0, length, length // 3)
+    assert len(points) == 2 * (length + 1) and cache.stats()['misses'] == 1
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from raster.triangle import triangle_coverage, shade_coverage, rasterize_triangle, rasterize_mesh, rasterize_textured
+from raster.texture import Texture
+from raster.cache import RasterCache
+
+CANVAS_SIZES = [100, 512, 2048, 4096]
+COLORS = np.array([[255, 0, 0], [0, 255, 0], [0, 0, 255]])
+UVS = np.array([[0, 0], [4, 0], [0, 4]])
+
+def large(size):
+    """Треугольник примерно на половину холста"""
+    return np.array([[0.1, 0.05], [0.95, 0.3], [0.4, 0.95]]) * size
+
+def thin(size):
+    """Длинный тонкий диагональный треугольник: почти весь прямоугольник пуст"""
+    return np.array([[0, 0], [size - 1, size - 3], [size - 3, size - 1]], dtype=float)
+
+@pytest.mark.parametrize("size", CANVAS_SIZES)
+@pytest.mark.parametrize("shape", [large, thin])
+def test_rasterize_triangle(benchmark, shape, size):
+    image = benchmark(rasterize_triangle, shape(size), COLORS, size, size)
+    assert image.any()
+
+@pytest.mark.parametrize("size", CANVAS_SIZES)
+@pytest.mark.parametrize("shape", [large, thin])
+@pytest.mark.parametrize("block", [8, 16])
+def test_rasterize_triangle_hierarchical(benchmark, block, shape, size):
+    image = benchmark(rasterize_triangle, shape(size), COLORS, size, size, None, None, block)
+    assert image.any()
+
+@pytest.mark.parametrize("size", CANVAS_SIZES)
+@pytest.mark.parametrize("samples", [4, 8, 16])
+def test_rasterize_triangle_aa(benchmark, samples, size):
+    image = benchmark(rasterize_triangle, large(size), COLORS, size, size, None, samples)
+    assert image.any()
+
+@pytest.mark.parametrize("size", CANVAS_SIZES)
+def test_recolor_cached_coverage(benchmark, size):
+    # Так SimpleTriangleApp.rasterize_triangle перекрашивает треугольник с неизменными вершинами
+    coverage = triangle_coverage(large(size), size, size)
+    image = benchmark(shade_coverage, coverage, COLORS[::-1], size, size)
+    assert image.any()
+
+@pytest.mark.parametrize("size", CANVAS_SIZES)
+def test_recolor_from_cache(benchmark, size):
+    # Так SimpleTriangleApp перекрашивает треугольник: покрытие из кэша, заново только цвета
+    cache = RasterCache(max_bytes=1 << 30)
+    cache.triangle_coverage(large(size), size, size)
+
+    def recolor():
+        return shade_coverage(cache.triangle_coverage(large(size), size, size), COLORS[::-1], size, size)
+
+    image = benchmark(recolor)
+    assert image.any() and cache.stats()['misses'] == 1
+
+@pytest.mark.parametrize("count", [1000, 100000])
+def test_rasterize_mesh(benchmark, count):
+    rng = np.random.default_rng(0)
+    vertices = rng.uniform(0, 1024, (count, 1, 2)) + rng.uniform(-10, 10, (count, 3, 2))
+    colors = rng.integers(0, 256, (count, 3, 3))
+    depth = rng.uniform(0, 1, (count, 3))
+    image, _ = benchmark(rasterize_mesh, vertices, colors, 1024, 1024, depth)
+    assert image.any()
+
+@pytest.fixture(scope="module")
+def texture():
+    rng = np.random.default_rng(0)
+    return Texture(rng.integers(0, 256, (1024, 1024, 3), dtype=np.uint8))
+
+@pytest.mark.parametrize("size", [100, 512, 2048])
+@pytest.mark.parametrize("filter", ["nearest", "bilinear"])
+@pytest.mark.parametrize("mipmap", [False, True])
+def test_rasterize_textured(benchmark, texture, size, filter, mipmap):
+    # Вершины на разной глубине: интерполяция перспективно-корректная
+    image = benchmark(rasterize_textured, large(size), UVS, texture, size, size,
+                      [1.0, 3.0, 2.0], filter, mipmap)
+    assert image.any()
@@ -0,0 +1,47 @@
+import argparse
+import json
+import sys
+
+def load(path, stat):
+    """Значение статистики stat каждого замера из JSON pytest-benchmark: {полное имя: секунды}"""
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    return {bench["fullname"]: bench["stats"][stat] for bench in data["benchmarks"]}
+
+def compare(base, new, threshold):
+    """
+    Сравнивает два запуска по общим замерам.
+    Возвращает список (имя, было, стало, изменение в процентах, регрессия ли).
+    """
+    rows = []
+    for name in sorted(base.keys() & new.keys()):
+        change = (new[name] - base[name]) / base[name] * 100
+        rows.append((name, base[name], new[name], change, change > threshold))
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение двух запусков pytest-benchmark")
+    parser.add_argument("base", help="JSON базового запуска (--benchmark-json)")
+    parser.add_argument("new", help="JSON нового запуска")
+    parser.add_argument("--stat", default="median", choices=["min", "max", "mean", "median"])
+    parser.add_argument("--threshold", type=float, default=10, help="допустимое замедление, %%")
+    args = parser.parse_args()
+
+    base = load(args.base, args.stat)
+    new = load(args.new, args.stat)
+    rows = compare(base, new, args.threshold)
+
+    width = max((len(row[0]) for row in rows), default=10)
+    for name, before, after, change, regression in rows:
+        mark = "РЕГРЕССИЯ" if regression else ""
+        print(f"{name:<{width}}  {before * 1000:10.3f} мс -> {after * 1000:10.3f} мс  {change:+7.1f}%  {mark}")
+
+    for name in sorted(base.keys() - new.keys()):
+        print(f"{name}: нет в новом запуске")
+    for name in sorted(new.keys() - base.keys()):
+        print(f"{name}: новый замер")
+
+    regressions = sum(row[4] for row in rows)
+    print("=" * 50)
+    print(f"Замеров: {len(rows)}, регрессий больше {args.threshold:g}%: {regressions}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,32 @@
+"""
+Набор замеров на pytest-benchmark. Файлы замеров называются bench_*.py и собираются,
+только если установлен pytest-benchmark; проверки правильности - в обычных test_*.py.
+
+Запуск и сохранение результатов:
+    python -m pytest benchmarks --benchmark-json=base.json
+Сравнение двух запусков:
+    python benchmarks/compare.py base.json new.json --threshold 10
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+def pytest_collect_file(file_path, parent):
+    # Файл, переданный в командной строке, pytest уже собирает сам
+    if parent.session.isinitpath(file_path):
+        return None
+    if (file_path.name.startswith("bench_") and file_path.suffix == ".py"
+            and parent.config.pluginmanager.hasplugin("benchmark")):
+        return pytest.Module.from_parent(parent, path=file_path)
+
+@pytest.fixture
+def fresh(benchmark):
+    """Замер функции, меняющей массив на месте: перед каждым запуском берется новая копия"""
+    def run(function, pixels, *args, **kwargs):
+        def setup():
+            return (pixels.copy(),) + args, kwargs
+        return benchmark.pedantic(function, setup=setup, rounds=5, warmup_rounds=1)
+    return run
@@ -0,0 +1,84 @@
+import numpy as np
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+
+def blank(size):
+    """Белое изображение size x size: вся площадь - одна область"""
+    return np.full((size, size, 3), 255, dtype=np.uint8)
+
+def spiral(size):
+    """
+    Концентрические квадратные стены толщиной в пиксель с проходом в каждой.
+    Коридор шириной в пиксель обходит каждое кольцо, поэтому в каждой строке много коротких отрезков.
+    """
+    pixels = blank(size)
+    for ring, offset in enumerate(range(0, size // 2, 2)):
+        last = size - 1 - offset
+        pixels[offset, offset:last + 1] = BLACK
+        pixels[last, offset:last + 1] = BLACK
+        pixels[offset:last + 1, offset] = BLACK
+        pixels[offset:last + 1, last] = BLACK
+        # Проходы чередуются между левой и правой стороной, чтобы путь шел по всему кольцу
+        gap = offset + 1 + (ring % 2) * max(0, last - offset - 2)
+        if offset > 0 and gap < last:
+            pixels[gap, offset if ring % 2 == 0 else last] = WHITE
+    return pixels
+
+def maze(size, seed=0):
+    """
+    Идеальный лабиринт алгоритмом двоичного дерева: из каждой клетки проход на север или на восток.
+    Коридоры образуют дерево, поэтому заливка обходит все тупики.
+    """
+    rng = np.random.default_rng(seed)
+    cells = (size - 1) // 2
+    pixels = np.zeros((size, size, 3), dtype=np.uint8)
+    pixels[1:2 * cells:2, 1:2 * cells:2] = WHITE
+
+    north = rng.random((cells, cells)) < 0.5
+    north[0, :] = False      # Верхний ряд может идти только на восток
+    north[:, -1] = True      # Правый столбец - только на север
+    north[0, -1] = False     # Угловая клетка никуда не ведет
+    east = ~north
+    east[0, -1] = False
+
+    rows, cols = np.nonzero(north)
+    pixels[2 * rows, 2 * cols + 1] = WHITE
+    rows, cols = np.nonzero(east)
+    pixels[2 * rows + 1, 2 * cols + 2] = WHITE
+    return pixels
+
+def disc(size):
+    """Маска круга, вписанного в квадрат size x size"""
+    ys, xs = np.mgrid[:size, :size]
+    center = (size - 1) / 2
+    return (xs - center) ** 2 + (ys - center) ** 2 <= (0.45 * size) ** 2
+
+def blocks(size, block=8, colors=4, seed=0):
+    """Изображение из квадратных блоков случайного цвета: много областей для выделения границ"""
+    rng = np.random.default_rng(seed)
+    count = -(-size // block)
+    palette = rng.integers(0, 256, (colors, 3), dtype=np.uint8)
+    grid = palette[rng.integers(0, colors, (count, count))]
+    return np.repeat(np.repeat(grid, block, axis=0), block, axis=1)[:size, :size].copy()
+
+def segments(count, size, seed=0):
+    """Случайные отрезки (count, 4) внутри холста size x size"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, size, (count, 4))
+
+def fan(size, count=64):
+    """Веер отрезков из центра холста к его краям"""
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    center = size // 2
+    radius = size // 2 - 1
+    ends = np.stack([center + np.round(radius * np.cos(angles)),
+                     center + np.round(radius * np.sin(angles))], axis=1).astype(int)
+    return [(center, center, int(x), int(y)) for x, y in ends]
+
+def trace(count, size):
+    """Ломаная из count вершин, раскручивающаяся спиралью от центра холста"""
+    turns = np.linspace(0, 1, count)
+    angle = turns * 200 * np.pi
+    radius = turns * (size / 2 - 4)
+    return np.stack([size / 2 + radius * np.cos(angle), size / 2 + radius * np.sin(angle)], axis=1)
@@ -0,0 +1,26 @@
+import io
+
+from raster.batch import read_jobs, run_jobs
+
+LINE = '"type": "bresenham_line", "width": 20, "height": 20, "segments": [[0, 0, 15, 4]]'
+
+def test_bad_lines_are_job_errors(tmp_path):
+    # Строка не-объект и битый JSON - ошибки своих заданий, остальные задания выполняются
+    stream = io.StringIO("[1, 2, 3]\n\n{bad\n{\"id\": \"a\", " + LINE + "}\n7\n")
+    results = {job_id: error for job_id, _, _, _, error in run_jobs(read_jobs(stream), tmp_path, workers=0)}
+
+    assert set(results) == {"1", "3", "a", "5"}
+    assert "JSON object" in results["1"] and "bad JSON" in results["3"] and "JSON object" in results["5"]
+    assert results["a"] is None and (tmp_path / "a.png").exists()
+
+def test_error_field_is_plain_job_data(tmp_path):
+    stream = io.StringIO("{\"id\": \"e\", \"error\": \"not a marker\", " + LINE + "}\n")
+    [(job_id, _, _, pixels, error)] = run_jobs(read_jobs(stream), tmp_path, workers=0)
+    assert job_id == "e" and error is None and pixels == 400
+
+def test_job_id_cannot_leave_out_dir(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    job = {"id": "../escape", "type": "bresenham_line", "width": 5, "height": 5, "segments": [[0, 0, 4, 4]]}
+    [(_, _, _, _, error)] = run_jobs([job], out, workers=0)
+    assert error is not None and not (tmp_path / "escape.png").exists()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from raster.lines import create_canvas
+from raster.fill import fill_mask, flood_fill, flood_fill_banded, fill_regions
+
+from shapes import blocks
+
+RED = (255, 0, 0)
+
+@pytest.mark.parametrize("fill, args", [(flood_fill, ()), (flood_fill_banded, (64,))],
+                         ids=["flood_fill", "flood_fill_banded"])
+def test_fill_memmap_canvas(tmp_path, fill, args):
+    # Одноканальный холст на диске, как его создает create_canvas по умолчанию
+    canvas = create_canvas(300, 200, path=tmp_path / "canvas.raw")
+    canvas[100, :] = 1.0
+    expected = np.zeros((200, 300), dtype=bool)
+    expected[:100] = True
+
+    assert np.array_equal(fill_mask(canvas, 5, 5), expected)
+    assert fill(canvas, 5, 5, 0.0, 0.5, *args)
+    canvas.flush()
+    assert np.array_equal(canvas == 0.5, expected)
+
+@pytest.mark.parametrize("tolerance", [0, 40])
+def test_fill_regions_matches_clicks(tolerance):
+    # Плавный переход цвета: при допуске область одной точки не должна растекаться по всему ряду
+    pixels = blocks(64)
+    pixels[:8] = np.arange(64, dtype=np.uint8)[None, :, None] * 4
+    seeds = [(0, 0), (40, 3), (10, 20), (-1, 5), (5, 64)]
+
+    expected = pixels.copy()
+    for x, y in seeds:
+        if 0 <= x < 64 and 0 <= y < 64:
+            flood_fill(expected, x, y, tuple(expected[y, x]), RED, tolerance)
+    fill_regions(pixels, seeds, RED, tolerance=tolerance)
+    assert np.array_equal(pixels, expected)
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from raster import instrument
+from raster.triangle import triangle_coverage, triangle_coverage_aa, rasterize_triangle, rasterize_mesh
+from raster.fill import flood_fill
+
+VERTICES = np.array([[5.3, 5.1], [40.7, 8.2], [10.4, 45.6]])
+BLACK = np.zeros((3, 3), dtype=int)
+
+@pytest.mark.parametrize("samples", [None, 4])
+def test_black_triangle_counts_covered_pixels(samples):
+    # Покрытие считается по маске растеризации, а не по цвету: черный треугольник тоже покрывает пиксели
+    if samples is None:
+        expected = triangle_coverage(VERTICES, 60, 50)[2].sum()
+    else:
+        expected = triangle_coverage_aa(VERTICES, 60, 50, samples)[2].sum()
+    with instrument.profiling():
+        rasterize_triangle(VERTICES, BLACK, 60, 50, samples=samples)
+        rasterize_mesh(VERTICES[None], BLACK[None], 60, 50)
+    report = instrument.report()
+    assert report['rasterize_triangle']['pixels'] == expected > 0
+    assert report['rasterize_mesh']['pixels'] == triangle_coverage(VERTICES, 60, 50)[2].sum()
+
+def test_flood_fill_counts_filled_pixels():
+    pixels = np.zeros((20, 30, 3), dtype=np.uint8)
+    pixels[10] = 9
+    with instrument.profiling():
+        flood_fill(pixels, 1, 1, (0, 0, 0), (1, 2, 3))
+    assert instrument.report()['flood_fill']['pixels'] == 10 * 30
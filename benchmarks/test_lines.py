@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from raster.lines import (bresenham_line, wu_line, bresenham_lines, wu_lines, wu_line_fixed, wu_lines_fixed,
+                          create_canvas, draw_pixels, draw_points, draw_coverage)
+
+@pytest.mark.parametrize("channels", [None, 3])
+def test_draw_pixels_add_saturates(channels):
+    # Три сложения по 200 на холсте uint8 дают 255, а не 88 после переполнения
+    canvas = create_canvas(4, 4, channels, dtype=np.uint8)
+    color = 200 if channels is None else (200, 100, 10)
+    draw_pixels(canvas, [1, 1, 1, 2], [2, 2, 2, 0], color=color, mode='add')
+    assert np.array_equal(canvas[2, 1], np.minimum(np.multiply(color, 3), 255))
+    assert np.array_equal(canvas[0, 2], color)
+    assert canvas.sum() == np.sum(np.minimum(np.multiply(color, 3), 255)) + np.sum(color)
+
+@pytest.mark.parametrize("batch, scalar", [(bresenham_lines, bresenham_line), (wu_lines, wu_line),
+                                           (wu_lines_fixed, wu_line_fixed)],
+                         ids=["bresenham", "wu", "wu_fixed"])
+def test_batch_lines_match_scalar(batch, scalar):
+    # Пакетные варианты должны давать те же точки в том же порядке, что и исходные построчные
+    lines = np.random.default_rng(0).integers(-20, 120, (200, 4))
+    expected = np.array([point for line in lines.tolist() for point in scalar(*line)])
+    assert np.array_equal(np.stack(batch(lines), axis=1), expected)
+
+def test_wu_fixed_matches_float_canvas():
+    # Целочисленный Ву рисует то же, что и wu_line, с точностью до одного уровня яркости.
+    # Концы внутри холста: при отрицательных координатах wu_line отсекает дробную часть к нулю
+    rng = np.random.default_rng(1)
+    for line in rng.integers(0, 80, (300, 4)).tolist():
+        fixed = draw_coverage(np.zeros((80, 80), dtype=np.uint8), *np.array(wu_line_fixed(*line)).T)
+        reference = create_canvas(80, 80)
+        draw_points(reference, wu_line(*line))
+        assert np.abs(fixed / 255 - reference).max() <= 1 / 255 + 1e-9, line
+
+@pytest.mark.parametrize("draw", [lambda: wu_line_fixed(0, 0.5, 10, 3), lambda: wu_lines_fixed([[0, 0, 10.25, 3]])],
+                         ids=["scalar", "batch"])
+def test_wu_fixed_rejects_fractional_endpoints(draw):
+    with pytest.raises(ValueError):
+        draw()
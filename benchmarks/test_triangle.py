@@ -0,0 +1,49 @@
+import importlib.util
+import os
+import types
+
+import numpy as np
+import pytest
+
+from raster.triangle import triangle_coverage, rasterize_triangle, rasterize_mesh
+from raster.cache import RasterCache
+
+@pytest.mark.parametrize("quantum", [0, 1 / 256])
+def test_cache_ignores_call_history(quantum):
+    # Вершина 39.999 после 40: при quantum=0 - точное покрытие, иначе - то же, что у нового кэша
+    first = np.array([[10, 10], [40, 10], [10, 40]], dtype=float)
+    second = first.copy()
+    second[1, 0] = 39.999
+
+    cache = RasterCache(quantum=quantum)
+    cache.triangle_coverage(first, 100, 100)
+    cached = cache.triangle_coverage(second, 100, 100)
+    fresh = RasterCache(quantum=quantum).triangle_coverage(second, 100, 100)
+    for got, want in zip(cached, fresh):
+        assert np.array_equal(got, want)
+    if not quantum:
+        assert np.array_equal(cached[2], triangle_coverage(second, 100, 100)[2])
+
+def _reference_app(vertices, colors, width, height):
+    """SimpleTriangleApp без окна: только то, что нужно попиксельному эталону"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Triangle", "ColorTriangle.py")
+    spec = importlib.util.spec_from_file_location("ColorTriangle", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    app = types.SimpleNamespace(vertices=vertices, colors=colors, width=width, height=height)
+    app.barycentric_coordinates = types.MethodType(module.SimpleTriangleApp.barycentric_coordinates, app)
+    app.reference = types.MethodType(module.SimpleTriangleApp.rasterize_triangle_reference, app)
+    return app
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rasterize_matches_reference(seed):
+    # Векторизованные пути должны совпадать с попиксельным эталоном пиксель в пиксель
+    rng = np.random.default_rng(seed)
+    vertices = rng.uniform(-10, 110, (3, 2))
+    colors = rng.integers(0, 256, (3, 3))
+    expected = _reference_app(vertices, colors, 100, 80).reference()
+
+    assert np.array_equal(rasterize_triangle(vertices, colors, 100, 80), expected)
+    assert np.array_equal(rasterize_triangle(vertices, colors, 100, 80, block=8), expected)
+    assert np.array_equal(rasterize_mesh(vertices[None], colors[None], 100, 80)[0], expected)
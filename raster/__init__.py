@@ -0,0 +1,16 @@
+"""
+Алгоритмы растеризации и заливки на массивах NumPy без графических зависимостей.
+matplotlib, tkinter и PIL импортируют только интерактивные программы в папках с примерами.
+"""
+from .lines import (bresenham_line, wu_line, bresenham_lines, wu_lines, wu_line_fixed, wu_lines_fixed,
+                    create_canvas, open_canvas, draw_pixels, draw_points, draw_coverage)
+from .triangle import (rasterize_triangle, triangle_coverage, triangle_coverage_aa, rasterize_mesh,
+                       rasterize_mesh_tiled, perspective_weights, interpolate_attributes, rasterize_textured)
+from .texture import Texture
+from .fill import (pixel_array, color_match, fill_spans, fill_mask, fill_region, fill_pattern, label_regions,
+                   flood_fill, flood_fill_banded, fill_regions)
+from .runs import RunMask
+from .buffer import ImageBuffer
+from .boundary import trace_contour, find_boundaries
+from .path import polyline_coverage, draw_polyline
+from .cache import RasterCache
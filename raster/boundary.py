@@ -0,0 +1,114 @@
+import numpy as np
+
+from .fill import label_regions
+
+# Направления обхода по часовой стрелке (ось y направлена вниз): E, SE, S, SW, W, NW, N, NE
+DIRECTIONS = np.array([(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)])
+
+def _backtrack_table():
+    """
+    Направление на точку возврата после шага в направлении d.
+    Точка возврата - последний проверенный фоновый сосед, то есть сосед в направлении d - 1.
+    """
+    table = []
+    for d in range(8):
+        dx, dy = DIRECTIONS[d - 1] - DIRECTIONS[d]
+        table.append(next(i for i, (x, y) in enumerate(DIRECTIONS) if x == dx and y == dy))
+    return table
+
+BACKTRACK = _backtrack_table()
+
+def _moore_walk(cells, offsets, start, back, value):
+    """
+    Обход контура по плоскому буферу cells с рамкой: соседи области - ячейки, равные value.
+    back - направление на фонового соседа начальной точки. Возвращает список плоских индексов.
+    """
+    # Критерий Джейкоба: остановка, когда из начальной точки повторяется первый шаг
+    contour = [start]
+    current, first_step = start, None
+    while True:
+        for i in range(1, 9):
+            d = (back + i) % 8
+            if cells[current + offsets[d]] == value:
+                break
+        else:
+            break  # Одиночный пиксель
+
+        if current == start:
+            if first_step is None:
+                first_step = d
+            elif d == first_step:
+                break
+        current = current + offsets[d]
+        back = BACKTRACK[d]
+        contour.append(current)
+
+    # Последняя точка совпадает с начальной
+    if len(contour) > 1:
+        contour.pop()
+    return contour
+
+def _to_points(contour, stride):
+    """Плоские индексы буфера с рамкой в массив (N, 2) координат (x, y)"""
+    contour = np.array(contour, dtype=int)
+    return np.stack([contour % stride - 1, contour // stride - 1], axis=1)
+
+def trace_contour(mask, x=None, y=None):
+    """
+    Обход границы области mask методом Мура с критерием остановки Джейкоба.
+    Без (x, y) обходится внешний контур, начиная с первого пикселя области в порядке строк.
+    Из точки (x, y) области идем вправо до крайнего пикселя и обходим контур, в который уперлись.
+    Возвращает упорядоченный по часовой стрелке массив (N, 2) координат (x, y) граничных пикселей.
+    """
+    height, width = mask.shape
+    if x is not None and not mask[y, x]:
+        return np.zeros((0, 2), dtype=int)
+
+    # Рамка из фоновых пикселей избавляет от проверок выхода за границы
+    padded = np.zeros((height + 2, width + 2), dtype=bool)
+    padded[1:-1, 1:-1] = mask
+    stride = width + 2
+    offsets = [int(dx + dy * stride) for dx, dy in DIRECTIONS]
+
+    if x is None:
+        first = np.flatnonzero(padded)
+        if not len(first):
+            return np.zeros((0, 2), dtype=int)
+        start = int(first[0])
+        back = 4  # Слева от первого пикселя - фон
+    else:
+        row = padded[y + 1, x + 1:]
+        start = (y + 1) * stride + x + 1 + int(np.argmin(row)) - 1
+        back = 0  # Справа от крайнего пикселя - фон
+
+    return _to_points(_moore_walk(padded.tobytes(), offsets, start, back, 1), stride)
+
+def find_boundaries(pixels, tolerance=0, connectivity=8, metric='channel'):
+    """
+    Границы всех областей изображения за один проход.
+    Возвращает карту меток (H, W), маску граничных пикселей (H, W)
+    и список внешних контуров: contours[k] - массив (N, 2) координат (x, y) области k.
+    """
+    labels = label_regions(pixels, tolerance, connectivity, metric)
+    height, width = labels.shape
+
+    # Граничный пиксель отличается по метке от одного из 4 соседей или лежит на краю изображения
+    padded = np.full((height + 2, width + 2), -1, dtype=np.int32)
+    padded[1:-1, 1:-1] = labels
+    inner = padded[1:-1, 1:-1]
+    edges = ((inner != padded[:-2, 1:-1]) | (inner != padded[2:, 1:-1])
+             | (inner != padded[1:-1, :-2]) | (inner != padded[1:-1, 2:]))
+
+    # Каждый контур начинается с первого пикселя области в порядке строк, слева от него - фон
+    stride = width + 2
+    offsets = [int(dx + dy * stride) for dx, dy in DIRECTIONS]
+    flat = padded.reshape(-1)
+    _, firsts = np.unique(flat, return_index=True)
+    cells = flat.tolist()
+    walked, sizes = [], []
+    for label, start in enumerate(firsts[1:].tolist()):
+        contour = _moore_walk(cells, offsets, start, 4, label)
+        walked.extend(contour)
+        sizes.append(len(contour))
+    contours = np.split(_to_points(walked, stride), np.cumsum(sizes)[:-1])
+    return labels, edges, contours
@@ -0,0 +1,129 @@
+"""
+Изображение PIL и массив NumPy над одной памятью для интерактивных программ.
+
+Заливка и поиск границ работают прямо с массивом pixels, без getpixel/putpixel и без копий
+изображения на каждый щелчок, а на экран Tk переносится только измененный прямоугольник.
+PIL и tkinter импортируются при создании объектов, поэтому импорт пакета их не требует.
+"""
+import numpy as np
+
+from .fill import pixel_array
+
+# Режимы, для которых Image.frombuffer читает пиксели прямо из массива без копии
+SHARED_MODES = ('L', 'RGBA', 'RGBX', 'CMYK')
+
+def union_box(first, second):
+    """Прямоугольник (x0, y0, x1, y1) включительно, содержащий оба; None - пустой прямоугольник"""
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return (min(first[0], second[0]), min(first[1], second[1]),
+            max(first[2], second[2]), max(first[3], second[3]))
+
+class ImageBuffer:
+    """
+    Пиксели изображения как массив pixels (H, W, C) и изображение image над теми же байтами.
+    Для режимов из SHARED_MODES запись в pixels сразу видна в image и наоборот, в том числе
+    при рисовании через ImageDraw. Для остальных (например, RGB) image - исходное изображение,
+    а sync() переносит в него измененный прямоугольник массива.
+    Измененные области отмечаются через mark(); take_dirty() отдает и сбрасывает их общий прямоугольник.
+    """
+
+    def __init__(self, image, share=True):
+        from PIL import Image
+
+        self.pixels = pixel_array(image)
+        self.shared = share and image.mode in SHARED_MODES
+        if self.shared:
+            self.image = Image.frombuffer(image.mode, image.size, self.pixels, 'raw', image.mode, 0, 1)
+            # Массив доступен для записи: без этого PIL скопирует пиксели при первом рисовании
+            self.image.readonly = 0
+        else:
+            self.image = image
+        self.dirty = None
+        self.unsynced = None
+
+    @classmethod
+    def new(cls, mode, size, color=0):
+        from PIL import Image
+
+        return cls(Image.new(mode, size, color))
+
+    @classmethod
+    def open(cls, path, mode='RGBA'):
+        from PIL import Image
+
+        with Image.open(path) as image:
+            return cls(image.convert(mode))
+
+    @property
+    def width(self):
+        return self.pixels.shape[1]
+
+    @property
+    def height(self):
+        return self.pixels.shape[0]
+
+    @property
+    def full_box(self):
+        return 0, 0, self.width - 1, self.height - 1
+
+    def mark(self, box=None):
+        """Отмечает измененный прямоугольник (x0, y0, x1, y1) включительно; None - все изображение"""
+        box = self.full_box if box is None else box
+        self.dirty = union_box(self.dirty, box)
+        if not self.shared:
+            self.unsynced = union_box(self.unsynced, box)
+
+    def take_dirty(self):
+        """Прямоугольник изменений с прошлого вызова или None, если изменений не было"""
+        box, self.dirty = self.dirty, None
+        return box
+
+    def sync(self):
+        """Переносит измененный прямоугольник массива в image, если память не общая"""
+        if self.unsynced is None:
+            return
+        from PIL import Image
+
+        x0, y0, x1, y1 = self.unsynced
+        self.unsynced = None
+        patch = np.ascontiguousarray(self.pixels[y0:y1 + 1, x0:x1 + 1])
+        self.image.paste(Image.frombytes(self.image.mode, (x1 - x0 + 1, y1 - y0 + 1), patch.tobytes()), (x0, y0))
+
+class PhotoView:
+    """
+    Изображение на холсте Tk. Первый show() и смена размера строят PhotoImage целиком,
+    дальше show(image, box) и paste() переносят в него только измененный прямоугольник.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.photo = None
+        self.item = None
+
+    def show(self, image, box=None):
+        """Показывает image; box (x0, y0, x1, y1) включительно - обновить только этот прямоугольник"""
+        import tkinter as tk
+        from PIL import ImageTk
+
+        if self.photo is not None and box is not None and (self.photo.width(), self.photo.height()) == image.size:
+            x0, y0, x1, y1 = box
+            self.paste(image.crop((x0, y0, x1 + 1, y1 + 1)), (x0, y0))
+            return
+
+        self.photo = ImageTk.PhotoImage(image)
+        if self.item is None:
+            self.item = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo)
+        else:
+            self.canvas.itemconfigure(self.item, image=self.photo)
+
+    def paste(self, patch, offset):
+        """Копирует изображение patch в показанное изображение с левым верхним углом в offset"""
+        from PIL import ImageTk
+
+        patch = ImageTk.PhotoImage(patch)
+        # ImageTk.PhotoImage.paste заменяет изображение целиком, поэтому кусок копируется командой Tk
+        self.canvas.tk.call(str(self.photo), 'copy', str(patch), '-to', offset[0], offset[1],
+                            '-compositingrule', 'set')
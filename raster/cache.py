@@ -0,0 +1,144 @@
+"""
+Кэш результатов растеризации для геометрии, которая рисуется снова и снова.
+
+Ключ - вид результата, координаты, округленные до quantum пикселя, и размер холста;
+значение - компактные массивы точек или покрытия, доступные только для чтения.
+Повторная отрисовка берет готовые массивы и сводится к записи в холст.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from .lines import bresenham_lines, wu_lines
+from .triangle import triangle_coverage, triangle_coverage_aa
+
+LINE_ALGORITHMS = ('bresenham', 'wu')
+
+# Примерные накладные расходы на одну запись помимо массивов
+ENTRY_OVERHEAD = 256
+
+def _nbytes(value):
+    """Байты массивов внутри значения (массив, кортеж или None)"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+def _freeze(value):
+    """Запрещает запись в массивы значения, чтобы вызывающий не испортил кэш"""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
+
+class RasterCache:
+    """
+    LRU-кэш с ограничением по суммарному размеру массивов max_bytes.
+    quantum - шаг округления координат: вершины, отличающиеся меньше чем на него, считаются
+    одинаковыми, и результат для них считается по округленным координатам, а не по координатам
+    первого вызова, поэтому не зависит от истории вызовов. 0 - точное совпадение координат,
+    тогда результат совпадает с вычислением без кэша.
+    """
+
+    def __init__(self, max_bytes=64 << 20, quantum=0):
+        self.max_bytes = max_bytes
+        self.quantum = quantum
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, coordinates):
+        """Координаты, округленные до quantum: по ним строятся и ключ, и сам результат"""
+        coordinates = np.asarray(coordinates, dtype=float)
+        if self.quantum:
+            coordinates = np.round(coordinates / self.quantum) * self.quantum
+        return coordinates
+
+    def key(self, kind, coordinates, width=None, height=None, *extra):
+        coordinates = self.quantize(coordinates)
+        return (kind, coordinates.shape, coordinates.tobytes(), width, height) + extra
+
+    def get(self, key):
+        """Значение по ключу или None; найденная запись становится самой свежей"""
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key][0]
+
+    def put(self, key, value):
+        """Сохраняет значение, вытесняя самые давние записи сверх max_bytes"""
+        size = _nbytes(value) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return value
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
+        self.entries[key] = (_freeze(value), size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+        return value
+
+    def _cached(self, key, compute):
+        # None - тоже результат (треугольник вне холста), поэтому проверяем наличие ключа
+        if key in self.entries:
+            return self.get(key)
+        self.misses += 1
+        return self.put(key, compute())
+
+    def line(self, algorithm, x0, y0, x1, y1):
+        """
+        Точки отрезка для draw_points: массив (N, 2) для 'bresenham' или (N, 3) с яркостью для 'wu',
+        в том же порядке, что bresenham_line и wu_line.
+        """
+        if algorithm not in LINE_ALGORITHMS:
+            raise ValueError(f"unknown line algorithm: {algorithm}")
+        segment = self.quantize([(x0, y0, x1, y1)])
+
+        def compute():
+            if algorithm == 'bresenham':
+                xs, ys = bresenham_lines(segment)
+                return np.stack([xs, ys], axis=1).astype(np.int32)
+            return np.stack(wu_lines(segment), axis=1)
+
+        return self._cached(self.key(algorithm, (x0, y0, x1, y1)), compute)
+
+    def triangle_coverage(self, vertices, width, height, samples=None, block=None):
+        """Результат triangle_coverage (или triangle_coverage_aa при samples) для вершин и холста"""
+        points = self.quantize(vertices)
+
+        def compute():
+            if samples is None:
+                return triangle_coverage(points, width, height, block)
+            return triangle_coverage_aa(points, width, height, samples)
+
+        return self._cached(self.key('triangle', vertices, width, height, samples), compute)
+
+    def clear(self):
+        """Удаляет все записи и обнуляет счетчики"""
+        self.entries.clear()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """Попадания, промахи, вытеснения и занятый объем"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,405 @@
+from collections import deque
+
+import numpy as np
+
+from .runs import RunMask
+
+def pixel_array(image):
+    """Пиксели изображения как массив (H, W, C), в том числе для одноканальных изображений"""
+    pixels = np.array(image)
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, None]
+    return pixels
+
+def color_match(pixels, color, tolerance=0, metric='channel'):
+    """
+    Маска пикселей, близких к color.
+    metric='channel' - отличие по каждому каналу не больше tolerance,
+    metric='euclidean' - евклидово расстояние в пространстве цветов не больше tolerance.
+    """
+    color = np.asarray(color).reshape(-1)
+    if tolerance == 0:
+        match = pixels[..., 0] == color[0]
+        for c in range(1, len(color)):
+            match &= pixels[..., c] == color[c]
+        return match
+
+    if metric == 'channel':
+        match = np.abs(pixels[..., 0].astype(np.int32) - int(color[0])) <= tolerance
+        for c in range(1, len(color)):
+            match &= np.abs(pixels[..., c].astype(np.int32) - int(color[c])) <= tolerance
+        return match
+    if metric == 'euclidean':
+        distance = np.zeros(pixels.shape[:-1], dtype=np.int64)
+        for c in range(len(color)):
+            distance += (pixels[..., c].astype(np.int64) - int(color[c])) ** 2
+        return distance <= tolerance * tolerance
+    raise ValueError(f"unknown metric: {metric}")
+
+def _with_channels(pixels):
+    """Одноканальный массив (H, W) как (H, W, 1) без копии; для np.memmap - тоже np.memmap над тем же файлом"""
+    return pixels[:, :, None] if pixels.ndim == 2 else pixels
+
+# Конструктор стека отрезков; raster.instrument подменяет его стеком со счетчиками
+_span_stack = list
+
+def find_spans(pixels, y, target_color, tolerance=0, metric='channel'):
+    """Отрезки строки y цвета target_color: массивы левых и правых границ (включительно)"""
+    match = color_match(pixels[y], target_color, tolerance, metric)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], match.view(np.int8), [0]))))
+    return edges[0::2], edges[1::2] - 1
+
+def _run_edge(pixels, y, x, step, target_color, tolerance, metric):
+    """
+    Край серии пикселей цвета target_color в строке y, начиная с совпадающего пикселя x, в сторону step.
+    Строка читается кусками растущей длины, поэтому длинная строка не загружается целиком.
+    """
+    width = pixels.shape[1]
+    chunk = 64
+    while 0 <= x + step < width:
+        if step > 0:
+            part = pixels[y, x + 1:min(width, x + 1 + chunk)]
+        else:
+            part = pixels[y, max(0, x - chunk):x][::-1]
+        misses = np.flatnonzero(~color_match(part, target_color, tolerance, metric))
+        if len(misses):
+            return x + step * int(misses[0])
+        x += step * len(part)
+        chunk *= 2
+    return x
+
+def _window_spans(pixels, y, lo, hi, target_color, tolerance, metric):
+    """Отрезки строки y цвета target_color, пересекающие столбцы [lo, hi], с полными границами"""
+    match = color_match(pixels[y, lo:hi + 1], target_color, tolerance, metric)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], match.view(np.int8), [0]))))
+    starts = (edges[0::2] + lo).tolist()
+    ends = (edges[1::2] - 1 + lo).tolist()
+    # Крайние отрезки окна могут продолжаться за его пределы
+    if starts and starts[0] == lo:
+        starts[0] = _run_edge(pixels, y, lo, -1, target_color, tolerance, metric)
+    if ends and ends[-1] == hi:
+        ends[-1] = _run_edge(pixels, y, hi, 1, target_color, tolerance, metric)
+    return starts, ends
+
+def _row_spans_fill(pixels, seeds, target_color, tolerance, reach, metric):
+    """
+    Строка сравнивается с цветом целиком, отрезки строки находятся один раз.
+    seeds - список (y, lo, hi): заливка начинается со всех отрезков строки y, пересекающих [lo, hi].
+    """
+    height = pixels.shape[0]
+    rows = {}
+    stack = _span_stack()
+
+    def push(k, lo, hi):
+        if k not in rows:
+            starts, ends = find_spans(pixels, k, target_color, tolerance, metric)
+            rows[k] = (starts, ends, np.zeros(len(starts), dtype=bool))
+        starts, ends, seen = rows[k]
+        # Отрезки строки k, пересекающиеся с [lo, hi] по x
+        first = np.searchsorted(ends, lo)
+        last = np.searchsorted(starts, hi, side='right')
+        for n in range(first, last):
+            if not seen[n]:
+                seen[n] = True
+                stack.append((k, n))
+
+    for y, lo, hi in seeds:
+        push(y, lo, hi)
+
+    spans = []
+    while stack:
+        j, i = stack.pop()
+        left, right = int(rows[j][0][i]), int(rows[j][1][i])
+        spans.append((j, left, right))
+
+        for k in (j - 1, j + 1):
+            if 0 <= k < height:
+                push(k, left - reach, right + reach)
+
+    return spans
+
+def _window_spans_fill(pixels, x, y, target_color, tolerance, reach, metric):
+    """
+    Соседняя строка сравнивается с цветом одним куском под отрезком-родителем.
+    Читаются только столбцы, которых касается область, но на каждый отрезок уходит
+    несколько вызовов NumPy, поэтому для массивов в памяти быстрее _row_spans_fill.
+    """
+    height, width = pixels.shape[:2]
+    starts, ends = _window_spans(pixels, y, x, x, target_color, tolerance, metric)
+    if not starts:
+        return []
+
+    # Для каждой строки - левые границы уже найденных отрезков
+    seen = {y: {starts[0]}}
+    stack = _span_stack()
+    stack.append((y, starts[0], ends[0]))
+    spans = []
+    while stack:
+        j, left, right = stack.pop()
+        spans.append((j, left, right))
+
+        lo, hi = max(0, left - reach), min(width - 1, right + reach)
+        for k in (j - 1, j + 1):
+            if k < 0 or k >= height:
+                continue
+            row_seen = seen.setdefault(k, set())
+            for start, end in zip(*_window_spans(pixels, k, lo, hi, target_color, tolerance, metric)):
+                if start not in row_seen:
+                    row_seen.add(start)
+                    stack.append((k, start, end))
+
+    return spans
+
+def fill_spans(pixels, x, y, target_color=None, tolerance=0, connectivity=4, metric='channel'):
+    """
+    Итеративная построчная заливка без рекурсии: в стек кладутся только еще не залитые отрезки.
+    Для холстов на np.memmap строки читаются только в пределах области, чтобы не подгружать
+    с диска строки растра целиком.
+    target_color=None - цвет пикселя (x, y); connectivity - 4 или 8.
+    Возвращает список отрезков (y, left, right) связной области, содержащей (x, y).
+    """
+    if connectivity not in (4, 8):
+        raise ValueError("connectivity must be 4 or 8")
+
+    pixels = _with_channels(pixels)
+    if target_color is None:
+        target_color = pixels[y, x]
+    target_color = np.asarray(target_color).reshape(-1)
+    # При 8-связности соседними считаются и отрезки, касающиеся по диагонали
+    reach = 1 if connectivity == 8 else 0
+
+    if isinstance(pixels, np.memmap):
+        return _window_spans_fill(pixels, x, y, target_color, tolerance, reach, metric)
+    return _row_spans_fill(pixels, [(y, x, x)], target_color, tolerance, reach, metric)
+
+def fill_mask(pixels, x, y, target_color=None, tolerance=0, connectivity=4, metric='channel'):
+    """Маска (H, W) области заливки из точки (x, y)"""
+    mask = np.zeros(pixels.shape[:2], dtype=bool)
+    for j, left, right in fill_spans(pixels, x, y, target_color, tolerance, connectivity, metric):
+        mask[j, left:right + 1] = True
+    return mask
+
+def fill_region(pixels, x, y, target_color=None, tolerance=0, connectivity=4, metric='channel'):
+    """
+    Область заливки из точки (x, y) как RunMask - отрезки строк из fill_spans без плотной маски.
+    Точка вне изображения или другого цвета дает пустую область.
+    """
+    pixels = _with_channels(pixels)
+    height, width = pixels.shape[:2]
+    if y < 0 or y >= height or x < 0 or x >= width:
+        return RunMask(shape=(height, width))
+    if target_color is not None and not color_match(pixels[y, x], target_color, tolerance, metric):
+        return RunMask(shape=(height, width))
+    return RunMask.from_spans(fill_spans(pixels, x, y, target_color, tolerance, connectivity, metric),
+                              (height, width))
+
+def fill_pattern(pixels, x, y, pattern, origin=None, target_color=None, tolerance=0, connectivity=4,
+                 metric='channel'):
+    """
+    Заливка области точки (x, y) узором pattern (h, w, C) на месте.
+    Узор повторяется плиткой от точки origin (по умолчанию (x, y)): одна выборка по всем пикселям области.
+    Возвращает маску области.
+    """
+    pixels = _with_channels(pixels)
+    pattern = _with_channels(pattern)
+    mask = fill_mask(pixels, x, y, target_color, tolerance, connectivity, metric)
+    ys, xs = np.nonzero(mask)
+    origin_x, origin_y = (x, y) if origin is None else origin
+    height, width = pattern.shape[:2]
+    pixels[ys, xs] = pattern[(ys - origin_y) % height, (xs - origin_x) % width]
+    return mask
+
+def _neighbor_match(a, b, tolerance, metric):
+    """Попарное сравнение соседних пикселей a и b с допуском"""
+    if tolerance == 0:
+        return np.all(a == b, axis=-1)
+    diff = a.astype(np.int64) - b.astype(np.int64)
+    if metric == 'channel':
+        return np.all(np.abs(diff) <= tolerance, axis=-1)
+    if metric == 'euclidean':
+        return np.sum(diff * diff, axis=-1) <= tolerance * tolerance
+    raise ValueError(f"unknown metric: {metric}")
+
+def _union_find(count, a, b):
+    """Корни компонент связности графа из count вершин с ребрами (a, b), векторизованно"""
+    parent = np.arange(count)
+    while len(a):
+        ra, rb = parent[a], parent[b]
+        differ = ra != rb
+        a, b, ra, rb = a[differ], b[differ], ra[differ], rb[differ]
+        if not len(a):
+            break
+        # Подвешиваем больший корень к меньшему, затем сжимаем пути до корней
+        np.minimum.at(parent, np.maximum(ra, rb), np.minimum(ra, rb))
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+    return parent
+
+def label_regions(pixels, tolerance=0, connectivity=4, metric='channel'):
+    """
+    Разметка всех связных областей изображения за один проход.
+    Соседние пиксели относятся к одной области, если их цвета совпадают с допуском tolerance.
+    При tolerance > 0 допуск считается между соседями, а не от цвета одной точки, поэтому область
+    тянется вдоль плавного перехода цвета и бывает шире заливки flood_fill из любой своей точки.
+    Возвращает массив меток (H, W) со значениями 0..K-1; область точки (x, y) - labels == labels[y, x].
+    """
+    if connectivity not in (4, 8):
+        raise ValueError("connectivity must be 4 or 8")
+
+    pixels = _with_channels(pixels)
+    height, width = pixels.shape[:2]
+
+    # Первый проход: горизонтальные серии одинаковых пикселей получают свой номер
+    same_right = _neighbor_match(pixels[:, :-1], pixels[:, 1:], tolerance, metric)
+    starts = np.ones((height, width), dtype=bool)
+    starts[:, 1:] = ~same_right
+    runs = np.cumsum(starts.reshape(-1)).reshape(height, width) - 1
+
+    # Второй проход: объединяем серии, связанные с соседней строкой
+    pairs = [(np.s_[:-1, :], np.s_[1:, :])]
+    if connectivity == 8:
+        pairs.append((np.s_[:-1, :-1], np.s_[1:, 1:]))
+        pairs.append((np.s_[:-1, 1:], np.s_[1:, :-1]))
+
+    a, b = [], []
+    for upper, lower in pairs:
+        linked = _neighbor_match(pixels[upper], pixels[lower], tolerance, metric)
+        a.append(runs[upper][linked])
+        b.append(runs[lower][linked])
+    a = np.concatenate(a)
+    b = np.concatenate(b)
+
+    # Одна пара серий может быть связана многими пикселями
+    count = int(runs[-1, -1]) + 1
+    edges = np.unique(a * count + b)
+    roots = _union_find(count, edges // count, edges % count)
+
+    _, labels = np.unique(roots, return_inverse=True)
+    return labels[runs].astype(np.int32)
+
+def flood_fill(pixels, x, y, target_color, replacement_color, tolerance=0, connectivity=4, metric='channel'):
+    """
+    Заливка массива pixels (H, W) или (H, W, C) на месте цветом replacement_color из точки (x, y).
+    Возвращает число залитых пикселей: 0, если пиксели не изменились.
+    """
+    pixels = _with_channels(pixels)
+    height, width = pixels.shape[:2]
+    if y < 0 or y >= height or x < 0 or x >= width:
+        return 0
+    if not color_match(pixels[y, x], target_color, tolerance, metric):
+        return 0
+    replacement = np.asarray(replacement_color).reshape(-1)
+    if np.array_equal(pixels[y, x], replacement):
+        return 0
+
+    filled = 0
+    for j, left, right in fill_spans(pixels, x, y, target_color, tolerance, connectivity, metric):
+        pixels[j, left:right + 1] = replacement
+        filled += right - left + 1
+    return filled
+
+def flood_fill_banded(pixels, x, y, target_color, replacement_color, band=256, tolerance=0, connectivity=4,
+                      metric='channel'):
+    """
+    Заливка по полосам из band строк для изображений, которые не помещаются в память (np.memmap).
+    В памяти одновременно одна полоса: она заливается построчным алгоритмом и записывается обратно.
+    Отрезки на краях полосы становятся границей для соседних полос и попадают в очередь,
+    поэтому область, возвращающаяся вверх, снова открывает уже обработанные полосы.
+    Залитые пиксели отличаются от цвета области по цвету, поэтому replacement_color
+    не должен совпадать с target_color с учетом tolerance.
+    Возвращает число залитых пикселей: 0, если пиксели не изменились.
+    """
+    if connectivity not in (4, 8):
+        raise ValueError("connectivity must be 4 or 8")
+
+    pixels = _with_channels(pixels)
+    height, width = pixels.shape[:2]
+    if y < 0 or y >= height or x < 0 or x >= width:
+        return 0
+    target_color = np.asarray(target_color).reshape(-1)
+    if not color_match(pixels[y, x], target_color, tolerance, metric):
+        return 0
+    replacement = np.asarray(replacement_color).reshape(-1)
+    if np.array_equal(pixels[y, x], replacement):
+        return 0
+    if color_match(replacement, target_color, tolerance, metric):
+        raise ValueError("replacement color must not match the target color")
+
+    reach = 1 if connectivity == 8 else 0
+    # Границы для каждой полосы: (строка, lo, hi), очередь полос с непустой границей
+    frontier = {y // band: [(y, x, x)]}
+    queue = deque([y // band])
+    filled = 0
+
+    def cross(row, spans):
+        """Переносит отрезки края полосы в соседнюю строку row, если там есть что заливать"""
+        starts, ends = find_spans(pixels, row, target_color, tolerance, metric)
+        seeds = []
+        for left, right in spans:
+            lo, hi = left - reach, right + reach
+            if np.searchsorted(ends, lo) < np.searchsorted(starts, hi, side='right'):
+                seeds.append((row, lo, hi))
+        if seeds:
+            b = row // band
+            if b not in frontier:
+                frontier[b] = []
+                queue.append(b)
+            frontier[b].extend(seeds)
+
+    while queue:
+        b = queue.popleft()
+        seeds = frontier.pop(b)
+        top = b * band
+        block = np.array(pixels[top:top + band])
+
+        spans = _row_spans_fill(block, [(j - top, lo, hi) for j, lo, hi in seeds],
+                                target_color, tolerance, reach, metric)
+        first_row, last_row = [], []
+        for j, left, right in spans:
+            block[j, left:right + 1] = replacement
+            filled += right - left + 1
+            if j == 0:
+                first_row.append((left, right))
+            if j == len(block) - 1:
+                last_row.append((left, right))
+        pixels[top:top + band] = block
+        del block
+
+        if first_row and top > 0:
+            cross(top - 1, first_row)
+        if last_row and top + band < height:
+            cross(top + band, last_row)
+
+    return filled
+
+def fill_regions(pixels, seeds, replacement_color, labels=None, tolerance=0, connectivity=4, metric='channel'):
+    """
+    Заливает на месте области всех точек seeds [(x, y), ...] так же, как щелчки flood_fill по очереди.
+    При tolerance=0 области берутся из карты меток: карту можно посчитать один раз через label_regions
+    и передавать при каждом вызове, тогда каждая точка стоит одного обращения к массиву.
+    Возвращает карту меток.
+    При tolerance > 0 области label_regions шире заливки из точки, поэтому каждая точка заливается
+    отдельно с допуском от своего цвета, карта меток не используется и возвращается None.
+    Точки вне изображения пропускаются.
+    """
+    pixels = _with_channels(pixels)
+    height, width = pixels.shape[:2]
+    xs, ys = np.asarray(seeds, dtype=np.int64).reshape(-1, 2).T
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    xs, ys = xs[inside], ys[inside]
+
+    if tolerance > 0:
+        if labels is not None:
+            raise ValueError("a label map can only be reused with tolerance 0")
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            flood_fill(pixels, x, y, pixels[y, x].copy(), replacement_color, tolerance, connectivity, metric)
+        return None
+
+    if labels is None:
+        labels = label_regions(pixels, 0, connectivity, metric)
+    mask = np.isin(labels, labels[ys, xs])
+    pixels[mask] = np.asarray(replacement_color).reshape(-1)
+    return labels
@@ -0,0 +1,213 @@
+"""
+Необязательные счетчики по этапам: число вызовов, пиксели, отрезки заливки, глубина стека и время.
+
+Пока счетчики выключены, функции пакета не обернуты и работают без накладных расходов.
+enable() подменяет их обертками во всех загруженных модулях, в том числе в программах,
+импортировавших функции через from raster... import, а disable() возвращает исходные:
+
+    from raster import instrument
+    with instrument.profiling() as counters:
+        flood_fill(pixels, x, y, target, color)
+    print(instrument.to_json())
+"""
+import importlib
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+FIELDS = ('calls', 'seconds', 'pixels', 'spans', 'depth')
+
+def _length(result, args, kwargs):
+    return {'pixels': len(result)}
+
+def _first_length(result, args, kwargs):
+    return {'pixels': len(result[0])}
+
+def _argument_length(result, args, kwargs):
+    return {'pixels': len(args[1]) if len(args) > 1 else len(kwargs.get('points', kwargs.get('xs', ())))}
+
+def _coverage(result, args, kwargs):
+    return {'pixels': 0 if result is None else result[3].shape[1]}
+
+def _nested(result, args, kwargs):
+    # Пиксели считаются по вложенным этапам из NESTED
+    return {}
+
+def _depth(result, args, kwargs):
+    # Буфер глубины бесконечен там, где не нарисован ни один треугольник
+    return {'pixels': int(np.count_nonzero(np.isfinite(result[1])))}
+
+def _filled(result, args, kwargs):
+    return {'pixels': int(result)}
+
+def _spans(result, args, kwargs):
+    return {'spans': len(result), 'pixels': sum(right - left + 1 for _, left, right in result)}
+
+def _labels(result, args, kwargs):
+    labels = result[0] if isinstance(result, tuple) else result
+    return {'pixels': labels.size}
+
+# Этап -> (модуль, функция, что считать по результату)
+STAGES = {
+    'bresenham_line': ('raster.lines', 'bresenham_line', _length),
+    'wu_line': ('raster.lines', 'wu_line', _length),
+    'wu_line_fixed': ('raster.lines', 'wu_line_fixed', _length),
+    'bresenham_lines': ('raster.lines', 'bresenham_lines', _first_length),
+    'wu_lines': ('raster.lines', 'wu_lines', _first_length),
+    'wu_lines_fixed': ('raster.lines', 'wu_lines_fixed', _first_length),
+    'draw_points': ('raster.lines', 'draw_points', _argument_length),
+    'draw_pixels': ('raster.lines', 'draw_pixels', _argument_length),
+    'polyline_coverage': ('raster.path', 'polyline_coverage', _first_length),
+    'triangle_coverage': ('raster.triangle', 'triangle_coverage', _coverage),
+    'triangle_coverage_aa': ('raster.triangle', 'triangle_coverage_aa', _coverage),
+    'rasterize_triangle': ('raster.triangle', 'rasterize_triangle', _nested),
+    'rasterize_textured': ('raster.triangle', 'rasterize_textured', _nested),
+    'rasterize_mesh': ('raster.triangle', 'rasterize_mesh', _depth),
+    'fill_spans': ('raster.fill', 'fill_spans', _spans),
+    'flood_fill': ('raster.fill', 'flood_fill', _filled),
+    'flood_fill_banded': ('raster.fill', 'flood_fill_banded', _filled),
+    'label_regions': ('raster.fill', 'label_regions', _labels),
+    'trace_contour': ('raster.boundary', 'trace_contour', _length),
+    'find_boundaries': ('raster.boundary', 'find_boundaries', _labels),
+}
+
+# Этап -> вложенные этапы покрытия: пиксели этапа - то, что они насчитали за время его вызова,
+# то есть покрытые треугольником пиксели независимо от их цвета
+NESTED = {
+    'rasterize_triangle': ('triangle_coverage', 'triangle_coverage_aa'),
+    'rasterize_textured': ('triangle_coverage',),
+}
+
+_counters = {}
+# Подмененные ссылки: (словарь модуля, имя, исходная функция)
+_patched = []
+
+def _stage(name):
+    if name not in _counters:
+        _counters[name] = dict.fromkeys(FIELDS, 0)
+        _counters[name]['seconds'] = 0.0
+    return _counters[name]
+
+class _SpanStack(list):
+    """
+    Стек построчной заливки (fill_spans, flood_fill_banded), который считает
+    добавленные отрезки и наибольшую глубину в этапе 'span_stack'
+    """
+
+    def append(self, item):
+        list.append(self, item)
+        counters = _stage('span_stack')
+        counters['spans'] += 1
+        counters['depth'] = max(counters['depth'], len(self))
+
+def _nested_pixels(names):
+    return sum(_counters[name]['pixels'] for name in names if name in _counters)
+
+def _wrap(name, function, measure):
+    nested = NESTED.get(name, ())
+
+    def wrapper(*args, **kwargs):
+        before = _nested_pixels(nested)
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        counters = _stage(name)
+        counters['calls'] += 1
+        counters['seconds'] += elapsed
+        counters['pixels'] += _nested_pixels(nested) - before
+        for key, value in measure(result, args, kwargs).items():
+            counters[key] += value
+        return result
+
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    wrapper.__wrapped__ = function
+    return wrapper
+
+def enabled():
+    return bool(_patched)
+
+def enable():
+    """Включает счетчики: подменяет функции этапов обертками во всех загруженных модулях"""
+    if _patched:
+        return
+
+    wrappers = {}
+    for name, (module_name, attribute, measure) in STAGES.items():
+        function = getattr(importlib.import_module(module_name), attribute)
+        wrappers[id(function)] = (function, _wrap(name, function, measure))
+
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, '__dict__', None)
+        if not isinstance(namespace, dict):
+            continue
+        for key, value in list(namespace.items()):
+            found = wrappers.get(id(value))
+            if found is not None and found[0] is value:
+                namespace[key] = found[1]
+                _patched.append((namespace, key, value))
+
+    fill = importlib.import_module('raster.fill')
+    _patched.append((fill.__dict__, '_span_stack', fill._span_stack))
+    fill._span_stack = _SpanStack
+
+def disable():
+    """Выключает счетчики и возвращает исходные функции; накопленные значения сохраняются"""
+    while _patched:
+        namespace, key, value = _patched.pop()
+        namespace[key] = value
+
+def reset():
+    _counters.clear()
+
+def report():
+    """
+    Счетчики по этапам: {этап: {'calls', 'seconds', 'pixels', 'spans', 'depth'}}.
+    Время вложенных этапов входит и во время внешних (fill_spans - в flood_fill).
+    """
+    return {name: dict(counters) for name, counters in sorted(_counters.items())}
+
+def to_json(indent=2):
+    return json.dumps(report(), indent=indent)
+
+@contextmanager
+def profiling(clear=True):
+    """Включает счетчики на время блока with и выдает словарь с их текущими значениями"""
+    if clear:
+        reset()
+    was_enabled = enabled()
+    enable()
+    try:
+        yield _counters
+    finally:
+        if not was_enabled:
+            disable()
+
+def profile_call(function, *args, profiler='cprofile', **kwargs):
+    """
+    Вызывает function(*args, **kwargs) под профилировщиком.
+    profiler='cprofile' возвращает (результат, pstats.Stats),
+    profiler='pyinstrument' - (результат, pyinstrument.Profiler); pyinstrument ставится отдельно.
+    """
+    if profiler == 'cprofile':
+        import cProfile
+        import pstats
+
+        session = cProfile.Profile()
+        result = session.runcall(function, *args, **kwargs)
+        return result, pstats.Stats(session)
+    if profiler == 'pyinstrument':
+        from pyinstrument import Profiler
+
+        session = Profiler()
+        session.start()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            session.stop()
+        return result, session
+    raise ValueError(f"unknown profiler: {profiler}")
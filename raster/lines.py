@@ -0,0 +1,471 @@
+import numpy as np
+
+def bresenham_line(x0, y0, x1, y1):
+    """
+    Целочисленный алгоритм Брезенхема для рисования отрезка
+    """
+    points = []
+
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+
+    x, y = x0, y0
+
+    x_step = 1 if x1 > x0 else -1
+    y_step = 1 if y1 > y0 else -1
+
+    points.append((x, y))
+
+    if dx > dy:
+        error = 2 * dy - dx
+        for i in range(dx):
+            if error >= 0:
+                y += y_step
+                error -= 2 * dx
+            x += x_step
+            error += 2 * dy
+            points.append((x, y))
+    else:
+        error = 2 * dx - dy
+        for i in range(dy):
+            if error >= 0:
+                x += x_step
+                error -= 2 * dy
+            y += y_step
+            error += 2 * dx
+            points.append((x, y))
+
+    return points
+
+def wu_line(x0, y0, x1, y1):
+    """
+    Алгоритм Ву для рисования сглаженного отрезка
+    """
+    points = []
+
+    def plot(x, y, intensity):
+        points.append((x, y, intensity))
+
+    steep = abs(y1 - y0) > abs(x1 - x0)
+
+    if steep:
+        x0, y0 = y0, x0
+        x1, y1 = y1, x1
+
+    if x0 > x1:
+        x0, x1 = x1, x0
+        y0, y1 = y1, y0
+
+    dx = x1 - x0
+    dy = y1 - y0
+
+    if dx == 0:
+        gradient = 1.0
+    else:
+        gradient = dy / dx
+
+    # первая конечная точка
+    xend = round(x0)
+    yend = y0 + gradient * (xend - x0)
+    xgap = 1 - (x0 + 0.5) % 1
+    xpxl1 = xend
+    ypxl1 = int(yend)
+
+    if steep:
+        plot(ypxl1, xpxl1, (1 - (yend % 1)) * xgap)
+        plot(ypxl1 + 1, xpxl1, (yend % 1) * xgap)
+    else:
+        plot(xpxl1, ypxl1, (1 - (yend % 1)) * xgap)
+        plot(xpxl1, ypxl1 + 1, (yend % 1) * xgap)
+
+    intery = yend + gradient
+
+    # вторая конечная точка
+    xend = round(x1)
+    yend = y1 + gradient * (xend - x1)
+    xgap = (x1 + 0.5) % 1
+    xpxl2 = xend
+    ypxl2 = int(yend)
+
+    if steep:
+        plot(ypxl2, xpxl2, (1 - (yend % 1)) * xgap)
+        plot(ypxl2 + 1, xpxl2, (yend % 1) * xgap)
+    else:
+        plot(xpxl2, ypxl2, (1 - (yend % 1)) * xgap)
+        plot(xpxl2, ypxl2 + 1, (yend % 1) * xgap)
+
+    # основная часть линии
+    for x in range(xpxl1 + 1, xpxl2):
+        if steep:
+            plot(int(intery), x, 1 - (intery % 1))
+            plot(int(intery) + 1, x, intery % 1)
+        else:
+            plot(x, int(intery), 1 - (intery % 1))
+            plot(x, int(intery) + 1, intery % 1)
+        intery += gradient
+
+    return points
+
+def _segment_steps(counts):
+    """Номер отрезка и номер шага внутри отрезка для каждой точки общего массива"""
+    segment = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    step = np.arange(counts.sum()) - offsets[segment]
+    return segment, step
+
+def bresenham_lines(segments):
+    """
+    Пакетный вариант bresenham_line для массива отрезков формы (N, 4): x0, y0, x1, y1.
+    Возвращает плоские массивы xs, ys - точки всех отрезков подряд в том же порядке,
+    что и bresenham_line для каждого отрезка.
+    """
+    segments = np.asarray(segments, dtype=np.int64).reshape(-1, 4)
+    x0, y0, x1, y1 = segments.T
+
+    dx = np.abs(x1 - x0)
+    dy = np.abs(y1 - y0)
+    x_step = np.where(x1 > x0, 1, -1)
+    y_step = np.where(y1 > y0, 1, -1)
+
+    # Основная ось - та, по которой делается шаг на каждой итерации
+    x_major = dx > dy
+    major = np.where(x_major, dx, dy)
+    minor = np.where(x_major, dy, dx)
+
+    segment, i = _segment_steps(major + 1)
+    major, minor, x_major = major[segment], minor[segment], x_major[segment]
+
+    # Число шагов по второй оси после i итераций: накопление ошибки в замкнутой форме
+    j = (2 * minor * i + major) // np.maximum(2 * major, 1)
+
+    xs = x0[segment] + x_step[segment] * np.where(x_major, i, j)
+    ys = y0[segment] + y_step[segment] * np.where(x_major, j, i)
+
+    return xs, ys
+
+def _accumulate_runs(first, step, counts):
+    """
+    Значения first, first + step, first + 2 * step, ... для каждого отрезка.
+    Суммы накапливаются последовательно, как в цикле wu_line, поэтому совпадают побитово.
+    """
+    out = np.empty(counts.sum())
+    offsets = np.cumsum(counts) - counts
+    # Отрезки близкой длины обрабатываются одной прямоугольной матрицей
+    sizes = 1 << np.ceil(np.log2(np.maximum(counts, 1))).astype(int)
+
+    for size in np.unique(sizes[counts > 0]):
+        group = np.nonzero((sizes == size) & (counts > 0))[0]
+        block = np.empty((len(group), size))
+        block[:] = step[group, None]
+        block[:, 0] = first[group]
+        np.add.accumulate(block, axis=1, out=block)
+
+        keep = np.arange(size) < counts[group, None]
+        positions = offsets[group, None] + np.arange(size)
+        out[positions[keep]] = block[keep]
+
+    return out
+
+def wu_lines(segments):
+    """
+    Пакетный вариант wu_line для массива отрезков формы (N, 4): x0, y0, x1, y1.
+    Возвращает плоские массивы xs, ys, intensity в том же порядке, что и wu_line.
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 4)
+    x0, y0, x1, y1 = segments.T.copy()
+
+    steep = np.abs(y1 - y0) > np.abs(x1 - x0)
+    x0, y0 = np.where(steep, y0, x0), np.where(steep, x0, y0)
+    x1, y1 = np.where(steep, y1, x1), np.where(steep, x1, y1)
+
+    swap = x0 > x1
+    x0, x1 = np.where(swap, x1, x0), np.where(swap, x0, x1)
+    y0, y1 = np.where(swap, y1, y0), np.where(swap, y0, y1)
+
+    dx = x1 - x0
+    dy = y1 - y0
+    gradient = np.where(dx == 0, 1.0, dy / np.where(dx == 0, 1.0, dx))
+
+    # Конечные точки
+    xend1 = np.round(x0)
+    yend1 = y0 + gradient * (xend1 - x0)
+    xgap1 = 1 - (x0 + 0.5) % 1
+    xend2 = np.round(x1)
+    yend2 = y1 + gradient * (xend2 - x1)
+    xgap2 = (x1 + 0.5) % 1
+
+    xpxl1 = xend1.astype(np.int64)
+    xpxl2 = xend2.astype(np.int64)
+    ypxl1 = np.trunc(yend1).astype(np.int64)
+    ypxl2 = np.trunc(yend2).astype(np.int64)
+
+    end_major = np.stack([xpxl1, xpxl1, xpxl2, xpxl2], axis=1)
+    end_minor = np.stack([ypxl1, ypxl1 + 1, ypxl2, ypxl2 + 1], axis=1)
+    end_intensity = np.stack([(1 - yend1 % 1) * xgap1, (yend1 % 1) * xgap1,
+                              (1 - yend2 % 1) * xgap2, (yend2 % 1) * xgap2], axis=1)
+
+    # Основная часть: по две точки на каждый x между конечными точками
+    steps = np.maximum(xpxl2 - xpxl1 - 1, 0)
+    segment, k = _segment_steps(steps)
+    intery = _accumulate_runs(yend1 + gradient, gradient, steps)
+    body_major = xpxl1[segment] + 1 + k
+    body_minor = np.trunc(intery).astype(np.int64)
+
+    # Раскладываем точки в порядке wu_line: 4 точки концов, затем пары основной части
+    counts = 4 + 2 * steps
+    offsets = np.cumsum(counts) - counts
+    total = counts.sum()
+    major = np.empty(total, dtype=np.int64)
+    minor = np.empty(total, dtype=np.int64)
+    intensity = np.empty(total)
+
+    end_positions = offsets[:, None] + np.arange(4)
+    major[end_positions] = end_major
+    minor[end_positions] = end_minor
+    intensity[end_positions] = end_intensity
+
+    body_positions = offsets[segment] + 4 + 2 * k
+    major[body_positions] = body_major
+    minor[body_positions] = body_minor
+    intensity[body_positions] = 1 - intery % 1
+    major[body_positions + 1] = body_major
+    minor[body_positions + 1] = body_minor + 1
+    intensity[body_positions + 1] = intery % 1
+
+    point_steep = np.repeat(steep, counts)
+    xs = np.where(point_steep, minor, major)
+    ys = np.where(point_steep, major, minor)
+
+    return xs, ys, intensity
+
+# Фиксированная точка 16.16: целая часть в старших 16 битах, дробная - в младших
+FIXED_SHIFT = 16
+FIXED_ONE = 1 << FIXED_SHIFT
+FIXED_MASK = FIXED_ONE - 1
+
+def _coverage(fraction):
+    """Дробная часть 16.16 в 8-битное покрытие 0..255 с округлением"""
+    return (fraction * 255 + (FIXED_ONE >> 1)) >> FIXED_SHIFT
+
+def wu_line_fixed(x0, y0, x1, y1):
+    """
+    Целочисленный вариант алгоритма Ву для отрезка с целыми концами.
+    Дробная часть y накапливается в фиксированной точке 16.16 с остатком, как ошибка в алгоритме
+    Брезенхема, поэтому погрешность не растет с длиной. Возвращает точки (x, y, покрытие 0..255)
+    в том же порядке, что и wu_line; покрытие отличается от 255 * intensity не больше чем на 1.
+    Дробные концы не округляются молча, а дают ValueError: для них есть wu_line.
+    """
+    if any(value != int(value) for value in (x0, y0, x1, y1)):
+        raise ValueError(f"wu_line_fixed needs integer endpoints, got {(x0, y0, x1, y1)}")
+    x0, y0, x1, y1 = int(x0), int(y0), int(x1), int(y1)
+    points = []
+
+    def plot(x, y, coverage):
+        points.append((x, y, coverage))
+
+    steep = abs(y1 - y0) > abs(x1 - x0)
+
+    if steep:
+        x0, y0 = y0, x0
+        x1, y1 = y1, x1
+
+    if x0 > x1:
+        x0, x1 = x1, x0
+        y0, y1 = y1, y0
+
+    dx = x1 - x0
+    dy = y1 - y0
+
+    # Концы целые: по x покрыта половина пикселя, по y - целый пиксель
+    half = _coverage(FIXED_ONE >> 1)
+    for x, y in ((x0, y0), (x1, y1)):
+        if steep:
+            plot(y, x, half)
+            plot(y + 1, x, 0)
+        else:
+            plot(x, y, half)
+            plot(x, y + 1, 0)
+
+    if dx == 0:
+        return points
+
+    # intery = y0 + k * dy / dx: целая часть шага, дробная часть шага и остаток от деления на dx
+    step, remainder = divmod(dy << FIXED_SHIFT, dx)
+    intery = (y0 << FIXED_SHIFT) + step
+    error = remainder
+
+    for x in range(x0 + 1, x1):
+        y = intery >> FIXED_SHIFT
+        upper = _coverage(intery & FIXED_MASK)
+        if steep:
+            plot(y, x, 255 - upper)
+            plot(y + 1, x, upper)
+        else:
+            plot(x, y, 255 - upper)
+            plot(x, y + 1, upper)
+        intery += step
+        error += remainder
+        if error >= dx:
+            error -= dx
+            intery += 1
+
+    return points
+
+def wu_lines_fixed(segments):
+    """
+    Пакетный вариант wu_line_fixed для целочисленного массива отрезков (N, 4): x0, y0, x1, y1.
+    Возвращает плоские массивы xs, ys (int64) и покрытие (uint8) в том же порядке, что и wu_line_fixed.
+    Как и wu_line_fixed, отвергает дробные концы с ValueError.
+    """
+    segments = np.asarray(segments)
+    if segments.dtype.kind not in 'iub' and np.any(segments != np.trunc(segments)):
+        raise ValueError("wu_lines_fixed needs integer endpoints")
+    segments = segments.astype(np.int64).reshape(-1, 4)
+    x0, y0, x1, y1 = segments.T
+
+    steep = np.abs(y1 - y0) > np.abs(x1 - x0)
+    x0, y0 = np.where(steep, y0, x0), np.where(steep, x0, y0)
+    x1, y1 = np.where(steep, y1, x1), np.where(steep, x1, y1)
+
+    swap = x0 > x1
+    x0, x1 = np.where(swap, x1, x0), np.where(swap, x0, x1)
+    y0, y1 = np.where(swap, y1, y0), np.where(swap, y0, y1)
+
+    dx = x1 - x0
+    dy = y1 - y0
+
+    # Основная часть: intery точно равен floor(y0 * 2^16 + k * dy * 2^16 / dx), как в накопителе
+    steps = np.maximum(dx - 1, 0)
+    segment, k = _segment_steps(steps)
+    intery = (y0[segment] << FIXED_SHIFT) + ((k + 1) * (dy[segment] << FIXED_SHIFT)) // dx[segment]
+    body_major = x0[segment] + 1 + k
+    body_minor = intery >> FIXED_SHIFT
+    upper = _coverage(intery & FIXED_MASK)
+
+    counts = 4 + 2 * steps
+    offsets = np.cumsum(counts) - counts
+    total = counts.sum()
+    major = np.empty(total, dtype=np.int64)
+    minor = np.empty(total, dtype=np.int64)
+    coverage = np.empty(total, dtype=np.uint8)
+
+    end_positions = offsets[:, None] + np.arange(4)
+    major[end_positions] = np.stack([x0, x0, x1, x1], axis=1)
+    minor[end_positions] = np.stack([y0, y0 + 1, y1, y1 + 1], axis=1)
+    coverage[end_positions] = [_coverage(FIXED_ONE >> 1), 0, _coverage(FIXED_ONE >> 1), 0]
+
+    body_positions = offsets[segment] + 4 + 2 * k
+    major[body_positions] = body_major
+    minor[body_positions] = body_minor
+    coverage[body_positions] = 255 - upper
+    major[body_positions + 1] = body_major
+    minor[body_positions + 1] = body_minor + 1
+    coverage[body_positions + 1] = upper
+
+    point_steep = np.repeat(steep, counts)
+    xs = np.where(point_steep, minor, major)
+    ys = np.where(point_steep, major, minor)
+
+    return xs, ys, coverage
+
+def _canvas_shape(width, height, channels):
+    return (height, width) if channels is None else (height, width, channels)
+
+def create_canvas(width, height, channels=None, dtype=float, path=None):
+    """
+    Создает холст для рисования (channels - число цветовых компонент, None - одноканальный).
+    С path холст - np.memmap в этом файле: файл создается разреженным, а в память подгружаются
+    только страницы строк, которых касаются рисование и заливка. Так можно работать с растрами
+    больше оперативной памяти; draw_pixels, draw_points и заливки принимают такой холст как обычный массив.
+    """
+    shape = _canvas_shape(width, height, channels)
+    if path is not None:
+        return np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+    return np.zeros(shape, dtype=dtype)
+
+def open_canvas(path, width, height, channels=None, dtype=float, mode='r+'):
+    """Открывает холст, ранее созданный create_canvas(..., path=path); изменения пишутся в файл"""
+    return np.memmap(path, dtype=dtype, mode=mode, shape=_canvas_shape(width, height, channels))
+
+BLEND_MODES = ('replace', 'max', 'add', 'alpha')
+
+def draw_pixels(canvas, xs, ys, intensity=None, color=1.0, mode='max'):
+    """
+    Рисует массивы точек на холсте (H, W) или (H, W, C).
+    intensity - покрытие точек от 0 до 1 (None - полное), color - число или цвет из C компонент.
+    Режимы: 'replace' - запись поверх, 'max' - максимум, 'add' - сложение (на целых холстах с насыщением),
+    'alpha' - наложение цвета с прозрачностью intensity в порядке следования точек.
+    """
+    if mode not in BLEND_MODES:
+        raise ValueError(f"unknown blend mode: {mode}")
+
+    xs = np.asarray(xs)
+    ys = np.asarray(ys)
+    height, width = canvas.shape[:2]
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    xs, ys = xs[inside], ys[inside]
+
+    if intensity is None:
+        alpha = np.ones(len(xs))
+    else:
+        alpha = np.asarray(intensity, dtype=float)[inside]
+    color = np.asarray(color, dtype=float)
+    if canvas.ndim == 3:
+        alpha = alpha[:, None]
+
+    if mode == 'alpha':
+        # Несколько наложений на один пиксель: c -> color + (c - color) * prod(1 - alpha)
+        pixels, inverse = np.unique(ys * width + xs, return_inverse=True)
+        transmit = np.ones(len(pixels))
+        np.multiply.at(transmit, inverse, 1 - alpha.reshape(len(xs), -1)[:, 0])
+        py, px = np.divmod(pixels, width)
+        if canvas.ndim == 3:
+            transmit = transmit[:, None]
+        canvas[py, px] = color + (canvas[py, px] - color) * transmit
+        return canvas
+
+    values = alpha * color
+    if np.issubdtype(canvas.dtype, np.integer):
+        # Целые значения отбрасывают дробную часть и насыщаются на пределах типа, а не переполняются
+        limits = np.iinfo(canvas.dtype)
+        values = np.clip(np.trunc(values), limits.min, limits.max)
+        if mode == 'add':
+            # Сумма копится в числах с плавающей точкой по каждому пикселю и только потом насыщается
+            pixels, inverse = np.unique(ys * width + xs, return_inverse=True)
+            py, px = np.divmod(pixels, width)
+            total = canvas[py, px].astype(float)
+            np.add.at(total, inverse, values)
+            canvas[py, px] = np.clip(total, limits.min, limits.max).astype(canvas.dtype)
+            return canvas
+    values = values.astype(canvas.dtype)
+    if mode == 'replace':
+        canvas[ys, xs] = values
+    elif mode == 'max':
+        np.maximum.at(canvas, (ys, xs), values)
+    else:
+        np.add.at(canvas, (ys, xs), values)
+    return canvas
+
+def draw_points(canvas, points, color=1.0):
+    """Рисует точки на холсте"""
+    if len(points) == 0:
+        return
+    points = np.asarray(points)
+    xs = points[:, 0].astype(np.int64)
+    ys = points[:, 1].astype(np.int64)
+    if points.shape[1] == 2:  # Для Брезенхема
+        draw_pixels(canvas, xs, ys, color=color, mode='replace')
+    else:  # Для Ву (x, y, intensity)
+        draw_pixels(canvas, xs, ys, points[:, 2], mode='max')
+
+def draw_coverage(canvas, xs, ys, coverage):
+    """
+    Рисует 8-битное покрытие (например, из wu_lines_fixed) на холсте uint8 (H, W) по максимуму,
+    без перевода в числа с плавающей точкой.
+    """
+    xs = np.asarray(xs)
+    ys = np.asarray(ys)
+    height, width = canvas.shape[:2]
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    np.maximum.at(canvas, (ys[inside], xs[inside]), np.asarray(coverage, dtype=canvas.dtype)[inside])
+    return canvas
@@ -0,0 +1,306 @@
+"""
+Толстые сглаженные ломаные: ширина, соединения, концы и штриховка.
+
+Покрытие пикселя считается по расстоянию от его центра до обводки и собирается
+максимумом в буфер, поэтому каждый пиксель смешивается с холстом один раз,
+даже если в нем сходятся несколько отрезков.
+"""
+import numpy as np
+
+from .lines import _segment_steps, draw_pixels
+
+JOINS = ('miter', 'bevel', 'round')
+CAPS = ('butt', 'square', 'round')
+
+# Примерное число пикселей-кандидатов, обрабатываемых за одну пачку
+PATH_BATCH_PIXELS = 1 << 21
+# Отсутствующая граница: пиксель всегда по нужную сторону от нее
+_FAR = 1e18
+
+def _rot(v):
+    """Поворот векторов (N, 2) на 90 градусов: нормаль слева от направления"""
+    return np.stack([-v[:, 1], v[:, 0]], axis=1)
+
+def _dedupe(vertices, ids):
+    """Убирает повторяющиеся подряд вершины одной ломаной"""
+    keep = np.ones(len(vertices), dtype=bool)
+    keep[1:] = (ids[1:] != ids[:-1]) | np.any(vertices[1:] != vertices[:-1], axis=1)
+    return vertices[keep], ids[keep]
+
+def _dash_path(vertices, dash, offset):
+    """
+    Режет ломаную на штрихи по шаблону dash: длины штрихов и пробелов по очереди,
+    шаблон нечетной длины повторяется дважды. offset - сдвиг начала шаблона вдоль пути.
+    Возвращает вершины всех штрихов подряд и номер штриха для каждой вершины.
+    """
+    pattern = np.asarray(dash, dtype=float).reshape(-1)
+    if len(pattern) % 2:
+        pattern = np.concatenate([pattern, pattern])
+    if len(pattern) == 0 or np.any(pattern < 0) or pattern.sum() <= 0:
+        raise ValueError("dash lengths must be non-negative with a positive sum")
+
+    lengths = np.hypot(*np.diff(vertices, axis=0).T)
+    if len(lengths) == 0:
+        return vertices[:0], np.zeros(0, dtype=np.int64)
+    seg_end = np.cumsum(lengths)
+    seg_start = seg_end - lengths
+    total = seg_end[-1]
+
+    # Интервалы штрихов в координате длины дуги
+    bounds = np.concatenate([[0], np.cumsum(pattern)])
+    period = bounds[-1]
+    k = np.arange(np.floor(offset / period), np.ceil((total + offset) / period) + 1)
+    a = (k[:, None] * period + bounds[:-1:2] - offset).ravel()
+    b = (k[:, None] * period + bounds[1::2] - offset).ravel()
+    inside = (b >= 0) & (a <= total)
+    a = np.clip(a[inside], 0, total)
+    b = np.clip(b[inside], 0, total)
+
+    # Отрезки, которые задевает каждый штрих
+    first = np.minimum(np.searchsorted(seg_end, a, side='left'), len(lengths) - 1)
+    last = np.maximum(np.searchsorted(seg_start, b, side='right') - 1, first)
+    counts = last - first + 1
+
+    dash_of_piece, step = _segment_steps(counts)
+    piece = first[dash_of_piece] + step
+    direction = np.diff(vertices, axis=0)[piece] / np.maximum(lengths[piece], 1e-300)[:, None]
+    t0 = np.maximum(a[dash_of_piece], seg_start[piece]) - seg_start[piece]
+    t1 = np.minimum(b[dash_of_piece], seg_end[piece]) - seg_start[piece]
+
+    # Штрих - начало его первого куска и концы всех кусков
+    sizes = counts + 1
+    offsets = np.cumsum(sizes) - sizes
+    head = np.cumsum(counts) - counts
+    out = np.empty((sizes.sum(), 2))
+    out[offsets] = vertices[piece[head]] + direction[head] * t0[head, None]
+    out[offsets[dash_of_piece] + 1 + step] = vertices[piece] + direction * t1[:, None]
+    return out, np.repeat(np.arange(len(sizes)), sizes)
+
+def _join_planes(u_in, u_out, half_width, join, miter_limit):
+    """
+    Границы соединения входящего (u_in) и исходящего (u_out) отрезков в общей вершине v.
+    Входящий отрезок оставляет пиксели с (p - v) . cut_in <= 0, исходящий - с (p - v) . cut_out >= 0:
+    для острого и скошенного углов это общая биссектриса, поэтому отрезки стыкуются без шва.
+    Фаска - сглаженная граница (p - v) . normal <= offset. Возвращает также вылет фигуры за вершину.
+    """
+    bisector = u_in + u_out
+    norm = np.hypot(bisector[:, 0], bisector[:, 1])
+    folded = norm < 1e-9  # Разворот назад
+    safe = np.where(folded, 1.0, norm)
+    ratio = 2 / np.maximum(norm, 1e-300)  # Длина острия в половинах ширины
+
+    if join == 'round':
+        return (u_in, u_out, np.zeros_like(u_in), np.full(len(u_in), _FAR), np.zeros(len(u_in)))
+
+    cut = np.where(folded[:, None], u_in, bisector / safe[:, None])
+    bevel = np.full(len(u_in), join == 'bevel') | (ratio > miter_limit)
+
+    # Фаска проходит через внешние углы обоих отрезков
+    cross = u_in[:, 0] * u_out[:, 1] - u_in[:, 1] * u_out[:, 0]
+    side = np.where(cross > 0, -1.0, 1.0)
+    normal = np.where(folded[:, None], u_in, side[:, None] * _rot(bisector) / safe[:, None])
+    normal = np.where(bevel[:, None], normal, 0.0)
+    offset = np.where(bevel, half_width * norm / 2, _FAR)
+
+    reach = np.where(bevel, half_width + 0.5, (half_width + 0.5) * np.minimum(ratio, miter_limit))
+    return cut, cut, normal, offset, reach
+
+def _stroke_parts(vertices, ids, half_width, join, cap, miter_limit):
+    """
+    Разбивает ломаные на примитивы обводки.
+    Отрезок задается концами a, b, направлением u, разрезами на концах (c0, c1),
+    сглаженными границами на концах (g0, o0), (g1, o1) и вылетом за концы.
+    Круги - скругленные соединения и концы.
+    """
+    count = len(vertices)
+    first = np.ones(count, dtype=bool)
+    first[1:] = ids[1:] != ids[:-1]
+    last = np.ones(count, dtype=bool)
+    last[:-1] = first[1:]
+
+    starts = np.nonzero(~last)[0]
+    a = vertices[starts]
+    b = vertices[starts + 1]
+    u = (b - a) / np.hypot(*(b - a).T)[:, None]
+
+    parts = len(starts)
+    c0, g0, c1, g1 = (np.zeros((parts, 2)) for _ in range(4))
+    o0, o1, e0, e1 = (np.zeros(parts) for _ in range(4))
+
+    # Соединения: отрезок k входит в вершину, k + 1 выходит из нее
+    inner = np.nonzero(~last[starts + 1])[0]
+    cut_in, cut_out, normal, offset, reach = _join_planes(u[inner], u[inner + 1], half_width, join, miter_limit)
+    c1[inner], g1[inner], o1[inner], e1[inner] = cut_in, normal, offset, reach
+    c0[inner + 1], g0[inner + 1], o0[inner + 1], e0[inner + 1] = cut_out, normal, offset, reach
+
+    # Концы ломаных
+    head = np.nonzero(first[starts])[0]
+    tail = np.nonzero(last[starts + 1])[0]
+    if cap == 'round':
+        c0[head], o0[head] = u[head], _FAR
+        c1[tail], o1[tail] = u[tail], _FAR
+    else:
+        grow = half_width if cap == 'square' else 0.0
+        g0[head], o0[head], e0[head] = -u[head], grow, grow + 0.5
+        g1[tail], o1[tail], e1[tail] = u[tail], grow, grow + 0.5
+
+    # Одиночные точки: квадратный конец дает квадрат по осям, круглый - круг, плоский - ничего
+    single = np.nonzero(first & last)[0]
+    if cap == 'square' and len(single):
+        dot = vertices[single]
+        ones = np.zeros((len(single), 2))
+        ones[:, 0] = 1
+        a, b, u = np.concatenate([a, dot]), np.concatenate([b, dot]), np.concatenate([u, ones])
+        c0, c1 = np.concatenate([c0, 0 * ones]), np.concatenate([c1, 0 * ones])
+        g0, g1 = np.concatenate([g0, -ones]), np.concatenate([g1, ones])
+        fill = np.full(len(single), half_width)
+        o0, o1 = np.concatenate([o0, fill]), np.concatenate([o1, fill])
+        e0, e1 = np.concatenate([e0, fill + 0.5]), np.concatenate([e1, fill + 0.5])
+
+    ends = first | last
+    round_at = np.zeros(count, dtype=bool)
+    if cap == 'round':
+        round_at |= ends
+    if join == 'round':
+        round_at |= ~ends
+    circles = vertices[round_at]
+
+    segments = (a, b, u, c0, g0, o0, c1, g1, o1, np.maximum(e0, e1))
+    return segments, circles
+
+def _chunks(sizes, limit):
+    """Границы групп подряд идущих элементов с суммарным размером около limit"""
+    total = np.cumsum(sizes)
+    cuts = np.searchsorted(total, np.arange(limit, total[-1], limit)) if len(total) else []
+    return np.unique(np.concatenate([[0], cuts, [len(sizes)]])).astype(int)
+
+def _segment_coverage(segments, half_width, box, buffer):
+    """Покрытие тел отрезков; максимум с тем, что уже есть в buffer"""
+    a, b, u, c0, g0, o0, c1, g1, o1, reach = segments
+    if len(a) == 0:
+        return
+
+    # Перебор вдоль основной оси: на каждом ее шаге - полоса пикселей поперек отрезка
+    x_major = np.abs(u[:, 0]) >= np.abs(u[:, 1])
+    axis = np.where(x_major, 0, 1)
+    rows = np.arange(len(a))
+    a_major, a_minor = a[rows, axis], a[rows, 1 - axis]
+    b_major = b[rows, axis]
+    slope = u[rows, 1 - axis] / u[rows, axis]
+    half = (half_width + 0.5) / np.abs(u[rows, axis])
+    # Вылет за концы плюс проекция ширины полосы на основную ось
+    spread = reach + (half_width + 0.5) * np.abs(u[rows, 1 - axis]) + 1
+    lo = np.floor(np.minimum(a_major, b_major) - spread).astype(np.int64)
+    hi = np.ceil(np.maximum(a_major, b_major) + spread).astype(np.int64)
+    steps = hi - lo + 1
+    across = int(np.ceil(2 * (half_width + 0.5) * np.sqrt(2))) + 2
+
+    normal = _rot(u)
+    bounds = _chunks(steps * across, PATH_BATCH_PIXELS)
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        seg, step = _segment_steps(steps[start:stop])
+        seg += start
+        major = lo[seg] + step
+        center = a_minor[seg] + (major - a_major[seg]) * slope[seg]
+        minor = np.floor(center - half[seg]).astype(np.int64)[:, None] + np.arange(across)
+        major = np.broadcast_to(major[:, None], minor.shape)
+        xs = np.where(x_major[seg, None], major, minor)
+        ys = np.where(x_major[seg, None], minor, major)
+
+        def dot(vectors, px, py):
+            return vectors[seg, 0, None] * px + vectors[seg, 1, None] * py
+
+        ax, ay = xs - a[seg, 0, None], ys - a[seg, 1, None]
+        bx, by = xs - b[seg, 0, None], ys - b[seg, 1, None]
+        distance = np.maximum(np.abs(dot(normal, ax, ay)) - half_width,
+                              np.maximum(dot(g0, ax, ay) - o0[seg, None], dot(g1, bx, by) - o1[seg, None]))
+        coverage = np.clip(0.5 - distance, 0, 1)
+        coverage *= (dot(c0, ax, ay) >= 0) & (dot(c1, bx, by) <= 0)
+        _accumulate(buffer, box, xs, ys, coverage)
+
+def _circle_coverage(centers, half_width, box, buffer):
+    """Покрытие кругов радиуса half_width; максимум с тем, что уже есть в buffer"""
+    if len(centers) == 0:
+        return
+    radius = int(np.ceil(half_width + 0.5)) + 1
+    window = np.arange(-radius, radius + 1)
+    size = len(window) ** 2
+    bounds = _chunks(np.full(len(centers), size), PATH_BATCH_PIXELS)
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        part = centers[start:stop]
+        xs = np.round(part[:, 0])[:, None, None] + window[None, None, :]
+        ys = np.round(part[:, 1])[:, None, None] + window[None, :, None]
+        distance = np.hypot(xs - part[:, 0, None, None], ys - part[:, 1, None, None])
+        coverage = np.clip(half_width + 0.5 - distance, 0, 1)
+        xs, ys = np.broadcast_arrays(xs, ys)
+        _accumulate(buffer, box, xs.astype(np.int64), ys.astype(np.int64), coverage)
+
+def _accumulate(buffer, box, xs, ys, coverage):
+    """Объединение покрытий максимумом внутри рамки box"""
+    x_min, y_min, x_max, y_max = box
+    keep = (coverage > 0) & (xs >= x_min) & (xs < x_max) & (ys >= y_min) & (ys < y_max)
+    index = (ys[keep] - y_min) * (x_max - x_min) + (xs[keep] - x_min)
+    np.maximum.at(buffer, index, coverage[keep].astype(buffer.dtype))
+
+def polyline_coverage(vertices, width, height, line_width=1.0, join='miter', cap='butt',
+                      dash=None, dash_offset=0.0, miter_limit=4.0, antialias=True):
+    """
+    Покрытие обводки ломаной с вершинами (N, 2) на холсте width x height.
+    Центр пикселя (x, y) - точка с целыми координатами, как у bresenham_line и wu_line.
+    join - соединение отрезков: 'miter' (острый угол, при длине острия больше miter_limit
+    половин ширины - фаска), 'bevel' или 'round'; cap - концы: 'butt', 'square' или 'round'.
+    dash - длины штрихов и пробелов в пикселях, dash_offset - сдвиг шаблона вдоль пути.
+    Возвращает массивы xs, ys, coverage (от 0 до 1) - по одному значению на пиксель.
+    """
+    if join not in JOINS:
+        raise ValueError(f"unknown line join: {join}")
+    if cap not in CAPS:
+        raise ValueError(f"unknown line cap: {cap}")
+    if line_width <= 0:
+        raise ValueError("line_width must be positive")
+
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+    empty = np.zeros(0, dtype=np.int64)
+    if len(vertices) == 0:
+        return empty, empty, np.zeros(0)
+
+    ids = np.zeros(len(vertices), dtype=np.int64)
+    vertices, ids = _dedupe(vertices, ids)
+    if dash is not None:
+        vertices, ids = _dash_path(vertices, dash, dash_offset)
+        vertices, ids = _dedupe(vertices, ids)
+    if len(vertices) == 0:
+        return empty, empty, np.zeros(0)
+
+    half_width = line_width / 2
+    # Рамка обводки с запасом на острия соединений
+    margin = (half_width + 0.5) * max(miter_limit, 1) + 2
+    x_min = max(int(np.floor(vertices[:, 0].min() - margin)), 0)
+    y_min = max(int(np.floor(vertices[:, 1].min() - margin)), 0)
+    x_max = min(int(np.ceil(vertices[:, 0].max() + margin)) + 1, width)
+    y_max = min(int(np.ceil(vertices[:, 1].max() + margin)) + 1, height)
+    if x_min >= x_max or y_min >= y_max:
+        return empty, empty, np.zeros(0)
+
+    box = (x_min, y_min, x_max, y_max)
+    buffer = np.zeros((y_max - y_min) * (x_max - x_min), dtype=np.float32)
+    segments, circles = _stroke_parts(vertices, ids, half_width, join, cap, miter_limit)
+    _segment_coverage(segments, half_width, box, buffer)
+    _circle_coverage(circles, half_width, box, buffer)
+
+    if not antialias:
+        buffer = np.where(buffer >= 0.5, 1.0, 0.0)
+    index = np.flatnonzero(buffer)
+    ys, xs = np.divmod(index, x_max - x_min)
+    return xs + x_min, ys + y_min, buffer[index].astype(float)
+
+def draw_polyline(canvas, vertices, color=1.0, line_width=1.0, join='miter', cap='butt',
+                  dash=None, dash_offset=0.0, miter_limit=4.0, antialias=True, mode='max'):
+    """
+    Рисует обводку ломаной на холсте (H, W) или (H, W, C) одним смешиванием на пиксель.
+    Параметры обводки - как у polyline_coverage, color и mode - как у draw_pixels.
+    """
+    height, width = canvas.shape[:2]
+    xs, ys, coverage = polyline_coverage(vertices, width, height, line_width, join, cap,
+                                         dash, dash_offset, miter_limit, antialias)
+    return draw_pixels(canvas, xs, ys, coverage, color, mode)
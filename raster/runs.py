@@ -0,0 +1,193 @@
+"""
+Области как списки отрезков строк (run-length encoding).
+
+Отрезок - строка row и столбцы от start до end включительно, как у fill_spans.
+На отрезок уходит 12 байт, поэтому область заливки или граница хранится в разы компактнее
+плотной маски (H, W) и списка кортежей, а объединение, пересечение и разность считаются
+одной сортировкой концов отрезков.
+"""
+import numpy as np
+
+def _sweep(rows, starts, ends, groups, count, keep):
+    """
+    Отрезки count наборов на общей оси row * stride + x, где в stride помещается строка целиком.
+    groups - номер набора для каждого отрезка, keep(counts) - какие точки оси войдут в результат
+    по числу покрывающих отрезков каждого набора (массив (наборы, точки)).
+    """
+    if not len(rows):
+        return (), (), ()
+    rows = rows.astype(np.int64)
+    low = min(int(starts.min()), 0)
+    starts = starts.astype(np.int64) - low
+    ends = ends.astype(np.int64) - low
+    stride = int(ends.max()) + 2
+    positions = np.concatenate([rows * stride + starts, rows * stride + ends + 1])
+    deltas = np.zeros((count, len(positions)), dtype=np.int64)
+    index = np.arange(len(rows))
+    deltas[groups, index] = 1
+    deltas[groups, index + len(rows)] = -1
+
+    order = np.argsort(positions, kind='stable')
+    positions = positions[order]
+    counts = np.cumsum(deltas[:, order], axis=1)
+
+    # Состояние после всех событий в одной точке, чтобы порядок событий в ней не влиял на результат
+    last = np.ones(len(positions), dtype=bool)
+    last[:-1] = positions[1:] != positions[:-1]
+    positions = positions[last]
+    inside = keep(counts[:, last])
+
+    before = np.concatenate([[False], inside[:-1]])
+    enter = positions[inside & ~before]
+    leave = positions[~inside & before]
+    out_rows = enter // stride
+    return out_rows, enter - out_rows * stride + low, leave - out_rows * stride - 1 + low
+
+class RunMask:
+    """
+    Область из отрезков строк: массивы rows, starts, ends (включительно) одинаковой длины,
+    упорядоченные по строке и столбцу, без пересечений и без соприкасающихся отрезков в строке.
+    shape - размер (H, W) изображения, к которому относится область, или None.
+    """
+
+    def __init__(self, rows=(), starts=(), ends=(), shape=None):
+        self.rows = np.asarray(rows, dtype=np.int32)
+        self.starts = np.asarray(starts, dtype=np.int32)
+        self.ends = np.asarray(ends, dtype=np.int32)
+        self.shape = shape
+
+    @classmethod
+    def _normalized(cls, rows, starts, ends, shape):
+        rows = np.asarray(rows, dtype=np.int64).reshape(-1)
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1)
+        ends = np.asarray(ends, dtype=np.int64).reshape(-1)
+        valid = ends >= starts
+        rows, starts, ends = rows[valid], starts[valid], ends[valid]
+        if not len(rows):
+            return cls(shape=shape)
+        return cls(*_sweep(rows, starts, ends, np.zeros(len(rows), dtype=np.int64), 1,
+                           lambda counts: counts[0] > 0), shape=shape)
+
+    @classmethod
+    def from_spans(cls, spans, shape=None):
+        """Область из отрезков (row, start, end) в любом порядке, например из fill_spans"""
+        spans = np.asarray(spans, dtype=np.int64).reshape(-1, 3)
+        return cls._normalized(spans[:, 0], spans[:, 1], spans[:, 2], shape)
+
+    @classmethod
+    def from_mask(cls, mask):
+        """Область из плотной маски (H, W)"""
+        mask = np.asarray(mask, dtype=bool)
+        height, width = mask.shape
+        padded = np.zeros((height, width + 2), dtype=np.int8)
+        padded[:, 1:-1] = mask
+        change = np.diff(padded.reshape(-1))
+        # В строке с рамкой из двух нулей серия не переходит на следующую строку
+        begin = np.flatnonzero(change == 1)
+        finish = np.flatnonzero(change == -1)
+        rows = begin // (width + 2)
+        return cls(rows, begin - rows * (width + 2), finish - rows * (width + 2) - 1, mask.shape)
+
+    @classmethod
+    def from_points(cls, points, shape=None):
+        """Область из пикселей (N, 2) с координатами (x, y), например из контура trace_contour"""
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        return cls._normalized(points[:, 1], points[:, 0], points[:, 0], shape)
+
+    @classmethod
+    def merge(cls, masks, shape=None):
+        """Объединение многих областей одной сортировкой"""
+        masks = list(masks)
+        if shape is None and masks:
+            shape = masks[0].shape
+        rows = np.concatenate([mask.rows for mask in masks]) if masks else ()
+        starts = np.concatenate([mask.starts for mask in masks]) if masks else ()
+        ends = np.concatenate([mask.ends for mask in masks]) if masks else ()
+        return cls._normalized(rows, starts, ends, shape)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __repr__(self):
+        return f"RunMask({len(self)} runs, area={self.area()}, shape={self.shape})"
+
+    @property
+    def nbytes(self):
+        return self.rows.nbytes + self.starts.nbytes + self.ends.nbytes
+
+    def area(self):
+        """Число пикселей области"""
+        return int(np.sum(self.ends.astype(np.int64) - self.starts + 1))
+
+    def bounds(self):
+        """Ограничивающий прямоугольник (min_x, min_y, max_x, max_y) или None для пустой области"""
+        if not len(self):
+            return None
+        return int(self.starts.min()), int(self.rows[0]), int(self.ends.max()), int(self.rows[-1])
+
+    def _combine(self, other, keep):
+        rows = np.concatenate([self.rows, other.rows])
+        starts = np.concatenate([self.starts, other.starts])
+        ends = np.concatenate([self.ends, other.ends])
+        groups = np.repeat([0, 1], [len(self), len(other)])
+        shape = self.shape if self.shape is not None else other.shape
+        return RunMask(*_sweep(rows, starts, ends, groups, 2, keep), shape=shape)
+
+    def union(self, other):
+        return self._combine(other, lambda counts: (counts[0] > 0) | (counts[1] > 0))
+
+    def intersect(self, other):
+        return self._combine(other, lambda counts: (counts[0] > 0) & (counts[1] > 0))
+
+    def difference(self, other):
+        return self._combine(other, lambda counts: (counts[0] > 0) & (counts[1] == 0))
+
+    __or__ = union
+    __and__ = intersect
+    __sub__ = difference
+
+    def __eq__(self, other):
+        if not isinstance(other, RunMask):
+            return NotImplemented
+        return (np.array_equal(self.rows, other.rows) and np.array_equal(self.starts, other.starts)
+                and np.array_equal(self.ends, other.ends))
+
+    __hash__ = None
+
+    def pixels(self):
+        """Координаты всех пикселей области: массивы xs, ys"""
+        lengths = self.ends.astype(np.int64) - self.starts + 1
+        run = np.repeat(np.arange(len(self)), lengths)
+        offsets = np.cumsum(lengths) - lengths
+        xs = self.starts[run] + (np.arange(lengths.sum()) - offsets[run])
+        return xs, self.rows[run].astype(np.int64)
+
+    def to_mask(self, shape=None):
+        """Плотная маска (H, W): на строку отрезка - две отметки и накопленная сумма"""
+        shape = shape or self.shape
+        if shape is None:
+            raise ValueError("shape is required for a mask without an image size")
+        height, width = shape
+        inside = (self.rows >= 0) & (self.rows < height)
+        rows = self.rows[inside]
+        starts = np.clip(self.starts[inside], 0, width)
+        ends = np.clip(self.ends[inside].astype(np.int64) + 1, 0, width)
+
+        marks = np.zeros((height, width + 1), dtype=np.int8)
+        # Отрезки строки не соприкасаются, поэтому отметки попадают в разные ячейки
+        marks[rows, starts] += 1
+        marks[rows, ends] -= 1
+        return np.cumsum(marks, axis=1, dtype=np.int8)[:, :width].astype(bool)
+
+    def contains(self, x, y):
+        """Лежит ли пиксель (x, y) в области"""
+        first = np.searchsorted(self.rows, y, side='left')
+        last = np.searchsorted(self.rows, y, side='right')
+        index = first + np.searchsorted(self.ends[first:last], x, side='left')
+        return bool(index < last and self.starts[index] <= x)
+
+    def fill(self, pixels, color):
+        """Записывает color во все пиксели области массива pixels (H, W, ...) на месте"""
+        xs, ys = self.pixels()
+        pixels[ys, xs] = np.asarray(color).reshape(-1) if pixels.ndim == 3 else color
+        return pixels
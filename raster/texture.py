@@ -0,0 +1,104 @@
+import numpy as np
+
+FILTERS = ('nearest', 'bilinear')
+WRAPS = ('repeat', 'clamp')
+
+def _downsample(level):
+    """Следующий уровень пирамиды: среднее блоков 2 x 2, нечетный край дублируется"""
+    height, width = level.shape[:2]
+    if height % 2 and height > 1:
+        level = np.concatenate([level, level[-1:]], axis=0)
+    if width % 2 and width > 1:
+        level = np.concatenate([level, level[:, -1:]], axis=1)
+    rows = 2 if level.shape[0] > 1 else 1
+    cols = 2 if level.shape[1] > 1 else 1
+    shape = (level.shape[0] // rows, rows, level.shape[1] // cols, cols, level.shape[2])
+    return level.reshape(shape).mean(axis=(1, 3), dtype=np.float32)
+
+class Texture:
+    """
+    Текстура (H, W) или (H, W, C) с заранее построенной пирамидой mip-уровней.
+    Координаты u, v от 0 до 1 идут вдоль ширины и высоты; wrap - 'repeat' или 'clamp' за их пределами.
+    """
+
+    def __init__(self, pixels, mipmaps=True, wrap='repeat'):
+        if wrap not in WRAPS:
+            raise ValueError(f"unknown wrap mode: {wrap}")
+        pixels = np.asarray(pixels)
+        if pixels.ndim == 2:
+            pixels = pixels[:, :, None]
+        if pixels.ndim != 3 or pixels.shape[0] == 0 or pixels.shape[1] == 0:
+            raise ValueError("texture must be a non-empty (H, W) or (H, W, C) array")
+
+        self.dtype = pixels.dtype
+        self.wrap = wrap
+        self.levels = [pixels.astype(np.float32)]
+        while mipmaps and max(self.levels[-1].shape[:2]) > 1:
+            self.levels.append(_downsample(self.levels[-1]))
+
+    @property
+    def shape(self):
+        return self.levels[0].shape
+
+    def level_of_detail(self, dudx, dvdx, dudy, dvdy):
+        """
+        Номер mip-уровня для каждой точки по производным текстурных координат вдоль экрана:
+        log2 от размера следа пикселя в текселях основного уровня, округленный до целого уровня.
+        """
+        height, width = self.shape[:2]
+        footprint = np.maximum(np.hypot(dudx * width, dvdx * height), np.hypot(dudy * width, dvdy * height))
+        lod = np.log2(np.maximum(footprint, 1e-12))
+        return np.clip(np.round(lod), 0, len(self.levels) - 1).astype(np.int64)
+
+    def _index(self, i, size):
+        """Индексы текселей с учетом режима wrap"""
+        if self.wrap == 'repeat':
+            return np.mod(i, size)
+        return np.clip(i, 0, size - 1)
+
+    def _sample_level(self, level, u, v, filter):
+        texels = self.levels[level]
+        height, width = texels.shape[:2]
+        if filter == 'nearest':
+            x = self._index(np.floor(u * width).astype(np.int64), width)
+            y = self._index(np.floor(v * height).astype(np.int64), height)
+            return texels[y, x]
+
+        # Центр текселя i - в точке (i + 0.5) / size
+        x = u * width - 0.5
+        y = v * height - 0.5
+        x0 = np.floor(x)
+        y0 = np.floor(y)
+        fx = (x - x0).astype(np.float32)[:, None]
+        fy = (y - y0).astype(np.float32)[:, None]
+        x0 = x0.astype(np.int64)
+        y0 = y0.astype(np.int64)
+        x1 = self._index(x0 + 1, width)
+        y1 = self._index(y0 + 1, height)
+        x0 = self._index(x0, width)
+        y0 = self._index(y0, height)
+
+        top = texels[y0, x0] * (1 - fx) + texels[y0, x1] * fx
+        bottom = texels[y1, x0] * (1 - fx) + texels[y1, x1] * fx
+        return top * (1 - fy) + bottom * fy
+
+    def sample(self, u, v, filter='bilinear', level=None):
+        """
+        Значения текстуры (K, C) в точках (u, v).
+        level - номер mip-уровня: число для всех точек, массив (K,) (например, из level_of_detail)
+        или None - основной уровень.
+        """
+        if filter not in FILTERS:
+            raise ValueError(f"unknown texture filter: {filter}")
+        u = np.asarray(u, dtype=float).reshape(-1)
+        v = np.asarray(v, dtype=float).reshape(-1)
+        if level is None or np.isscalar(level):
+            return self._sample_level(int(level or 0), u, v, filter)
+
+        level = np.asarray(level).reshape(-1)
+        out = np.empty((len(u), self.shape[2]), dtype=np.float32)
+        # Каждый уровень читается одной выборкой по своим точкам
+        for index in np.unique(level):
+            selected = level == index
+            out[selected] = self._sample_level(int(index), u[selected], v[selected], filter)
+        return out
@@ -0,0 +1,517 @@
+import numpy as np
+
+def bounding_box(vertices, width, height):
+    """Ограничивающий прямоугольник треугольника, обрезанный по размеру холста"""
+    xs = vertices[:, 0]
+    ys = vertices[:, 1]
+    min_x = max(0, int(min(xs)))
+    max_x = min(width - 1, int(max(xs)))
+    min_y = max(0, int(min(ys)))
+    max_y = min(height - 1, int(max(ys)))
+    return min_x, max_x, min_y, max_y
+
+def barycentric_grid(v1, v2, v3, min_x, max_x, min_y, max_y):
+    """
+    Барицентрические координаты сразу для всех пикселей прямоугольника.
+    Формула та же, что в barycentric_coordinates, поэтому результат совпадает побитово.
+    """
+    denom = (v2[1] - v3[1]) * (v1[0] - v3[0]) + (v3[0] - v2[0]) * (v1[1] - v3[1])
+
+    if abs(denom) < 1e-10:
+        return None
+
+    px = np.arange(min_x, max_x + 1) - v3[0]
+    py = (np.arange(min_y, max_y + 1) - v3[1])[:, None]
+
+    l1 = ((v2[1] - v3[1]) * px + (v3[0] - v2[0]) * py) / denom
+    l2 = ((v3[1] - v1[1]) * px + (v1[0] - v3[0]) * py) / denom
+    l3 = 1 - l1 - l2
+
+    return l1, l2, l3
+
+def barycentric_points(v1, v2, v3, xs, ys):
+    """Барицентрические координаты отдельных пикселей; формула и результат те же, что у barycentric_grid"""
+    denom = (v2[1] - v3[1]) * (v1[0] - v3[0]) + (v3[0] - v2[0]) * (v1[1] - v3[1])
+
+    px = xs - v3[0]
+    py = ys - v3[1]
+
+    l1 = ((v2[1] - v3[1]) * px + (v3[0] - v2[0]) * py) / denom
+    l2 = ((v3[1] - v1[1]) * px + (v1[0] - v3[0]) * py) / denom
+    l3 = 1 - l1 - l2
+
+    return l1, l2, l3
+
+def _edge_gradients(v1, v2, v3):
+    """Матрица (3, 2): строка i - (dl_i/dx, dl_i/dy), изменение барицентрической координаты на пиксель"""
+    denom = (v2[1] - v3[1]) * (v1[0] - v3[0]) + (v3[0] - v2[0]) * (v1[1] - v3[1])
+    grad = np.array([[v2[1] - v3[1], v3[0] - v2[0]],
+                     [v3[1] - v1[1], v1[0] - v3[0]]]) / denom
+    return np.vstack([grad, -grad.sum(axis=0)])
+
+# Блоки, на которые иерархический режим делит ограничивающий прямоугольник
+HIERARCHY_BLOCK = 16
+# Запас классификации блоков: намного больше ошибки округления функций ребер,
+# поэтому маска совпадает с попиксельной проверкой
+HIERARCHY_MARGIN = 1e-7
+
+def hierarchical_mask(v1, v2, v3, min_x, max_x, min_y, max_y, block=HIERARCHY_BLOCK):
+    """
+    Маска покрытия прямоугольника, построенная по блокам block x block.
+    Функции ребер линейны, поэтому их крайние значения в блоке - в его углах:
+    блок целиком внутри заливается сразу, целиком снаружи - пропускается,
+    и только блоки на ребрах проверяются попиксельно.
+    Работа пропорциональна покрытой площади и длине ребер, а не площади прямоугольника.
+    """
+    rows = max_y - min_y + 1
+    cols = max_x - min_x + 1
+    block_rows = -(-rows // block)
+    block_cols = -(-cols // block)
+
+    # Углы блоков, обрезанные по прямоугольнику
+    x0 = min_x + block * np.arange(block_cols)
+    y0 = min_y + block * np.arange(block_rows)
+    cx = np.stack([x0, np.minimum(x0 + block - 1, max_x)])[:, None, None, :]
+    cy = np.stack([y0, np.minimum(y0 + block - 1, max_y)])[None, :, :, None]
+    corners = barycentric_points(v1, v2, v3, cx, cy)
+
+    full = np.ones((block_rows, block_cols), dtype=bool)
+    empty = np.zeros((block_rows, block_cols), dtype=bool)
+    for plane in corners:
+        full &= plane.min(axis=(0, 1)) >= HIERARCHY_MARGIN
+        empty |= plane.max(axis=(0, 1)) < -HIERARCHY_MARGIN
+    partial = ~full & ~empty
+
+    # Маска с краем до целого числа блоков: (строка блока, строка в блоке, столбец блока, столбец в блоке)
+    padded = np.zeros((block_rows, block, block_cols, block), dtype=bool)
+    by, bx = np.nonzero(full)
+    padded[by, :, bx, :] = True
+
+    by, bx = np.nonzero(partial)
+    steps = np.arange(block)
+    ys = (y0[by][:, None, None] + steps[None, :, None]).astype(float)
+    xs = (x0[bx][:, None, None] + steps[None, None, :]).astype(float)
+    l1, l2, l3 = barycentric_points(v1, v2, v3, xs, ys)
+    padded[by[:, None, None], steps[None, :, None], bx[:, None, None], steps[None, None, :]] = \
+        (l1 >= 0) & (l2 >= 0) & (l3 >= 0)
+
+    return padded.reshape(block_rows * block, block_cols * block)[:rows, :cols]
+
+def triangle_coverage(vertices, width, height, block=None):
+    """
+    Пиксели, покрытые треугольником, и их барицентрические веса.
+    block - размер блока иерархического режима (например, 8 или 16) для длинных тонких треугольников,
+    большая часть прямоугольника которых пуста; None - проверка всех пикселей прямоугольника.
+    Результат обоих режимов совпадает побитово.
+    Возвращает (min_x, min_y, mask, weights), где weights - (3, K) для K покрытых пикселей,
+    или None, если треугольник ничего не покрывает.
+    """
+    min_x, max_x, min_y, max_y = bounding_box(vertices, width, height)
+    if min_x > max_x or min_y > max_y:
+        return None
+
+    v1, v2, v3 = vertices
+    if block is not None:
+        denom = (v2[1] - v3[1]) * (v1[0] - v3[0]) + (v3[0] - v2[0]) * (v1[1] - v3[1])
+        if abs(denom) < 1e-10:
+            return None
+        mask = hierarchical_mask(v1, v2, v3, min_x, max_x, min_y, max_y, block)
+        j, i = np.nonzero(mask)
+        weights = np.stack(barycentric_points(v1, v2, v3, (i + min_x).astype(float), (j + min_y).astype(float)))
+        return min_x, min_y, mask, weights
+
+    planes = barycentric_grid(v1, v2, v3, min_x, max_x, min_y, max_y)
+    if planes is None:
+        return None
+
+    l1, l2, l3 = planes
+    mask = (l1 >= 0) & (l2 >= 0) & (l3 >= 0)
+    weights = np.stack([l1[mask], l2[mask], l3[mask]])
+
+    return min_x, min_y, mask, weights
+
+# Смещения подвыборок от точки пикселя в 1/16 пикселя (стандартные шаблоны Direct3D)
+SAMPLE_PATTERNS = {
+    4: np.array([[-2, -6], [6, -2], [-6, 2], [2, 6]]) / 16,
+    8: np.array([[1, -3], [-1, 3], [5, 1], [-3, -5], [-5, 5], [-7, -1], [3, 7], [7, -7]]) / 16,
+    16: np.array([[1, 1], [-1, -3], [-3, 2], [4, -1], [-5, -2], [2, 5], [5, 3], [3, -5],
+                  [-2, 6], [0, -7], [-4, -6], [-6, 4], [-8, 0], [7, -4], [6, 7], [-7, -8]]) / 16,
+}
+
+def triangle_coverage_aa(vertices, width, height, samples=4):
+    """
+    Сглаженное покрытие: доля подвыборок шаблона SAMPLE_PATTERNS[samples], попавших в треугольник.
+    Пиксель, все подвыборки которого заведомо по одну сторону каждого ребра, решается по одной точке,
+    поэтому подвыборки считаются только у пикселей на ребрах, и работа растет с периметром, а не с площадью.
+    Возвращает (min_x, min_y, mask, weights, alpha): alpha - покрытие (K,) пикселей маски,
+    у пикселей на ребрах веса обрезаны до треугольника, чтобы цвет не выходил за цвета вершин.
+    """
+    if samples not in SAMPLE_PATTERNS:
+        raise ValueError(f"unsupported sample count: {samples}")
+    offsets = SAMPLE_PATTERNS[samples]
+    radius = np.abs(offsets).max()
+
+    xs = vertices[:, 0]
+    ys = vertices[:, 1]
+    min_x = max(0, int(np.floor(xs.min() - radius)))
+    max_x = min(width - 1, int(np.ceil(xs.max() + radius)))
+    min_y = max(0, int(np.floor(ys.min() - radius)))
+    max_y = min(height - 1, int(np.ceil(ys.max() + radius)))
+    if min_x > max_x or min_y > max_y:
+        return None
+
+    v1, v2, v3 = vertices
+    planes = barycentric_grid(v1, v2, v3, min_x, max_x, min_y, max_y)
+    if planes is None:
+        return None
+
+    # Изменение l1, l2, l3 при сдвиге на пиксель по x и по y
+    grad = _edge_gradients(v1, v2, v3)
+    # Наибольшее изменение каждой функции ребра в пределах шаблона
+    reach = np.abs(grad @ offsets.T).max(axis=1)
+
+    inside = np.ones(planes[0].shape, dtype=bool)
+    outside = np.zeros(planes[0].shape, dtype=bool)
+    for plane, margin in zip(planes, reach):
+        inside &= plane >= margin
+        outside |= plane < -margin
+    edge = ~inside & ~outside
+
+    # Подвыборки пикселей на ребрах - одна операция над массивом (K, samples)
+    shifts = grad @ offsets.T
+    hits = np.ones((np.count_nonzero(edge), samples), dtype=bool)
+    for plane, shift in zip(planes, shifts):
+        hits &= plane[edge][:, None] + shift[None, :] >= 0
+    edge_alpha = np.zeros(planes[0].shape)
+    edge_alpha[edge] = hits.mean(axis=1)
+
+    mask = inside | (edge_alpha > 0)
+    alpha = np.where(inside, 1.0, edge_alpha)[mask]
+    weights = np.clip(np.stack([plane[mask] for plane in planes]), 0, None)
+    weights /= weights.sum(axis=0)
+
+    return min_x, min_y, mask, weights, alpha
+
+def shade_coverage(coverage, colors, width, height):
+    """
+    Собирает изображение из готовых весов, поэтому смена одних цветов не требует растеризации.
+    Для покрытия из triangle_coverage_aa цвет пикселей на ребрах смешивается с черным фоном.
+    """
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    if coverage is None:
+        return image
+
+    min_x, min_y, mask, weights = coverage[:4]
+    rows, cols = mask.shape
+    region = image[min_y:min_y + rows, min_x:min_x + cols]
+    rgb = _shade(*weights, colors)
+    if len(coverage) > 4:
+        rgb = (rgb * coverage[4][:, None]).astype(np.uint8)
+    region[mask] = rgb
+
+    return image
+
+def perspective_weights(weights, w):
+    """
+    Перспективно-корректные веса из экранных барицентрических весов (3, K).
+    w - координата w трех вершин после проекции: по экрану линейны атрибуты, деленные на w,
+    поэтому веса l_i / w_i нормируются на их сумму.
+    """
+    scaled = weights / np.asarray(w, dtype=float).reshape(3, 1)
+    return scaled / scaled.sum(axis=0)
+
+def interpolate_attributes(coverage, attributes, w=None):
+    """
+    Значения вершинных атрибутов (3, C) во всех покрытых пикселях - массив (K, C)
+    в порядке пикселей маски из triangle_coverage.
+    С w интерполяция перспективно-корректная, без w - линейная по экрану, как цвета в rasterize_triangle.
+    """
+    weights = coverage[3]
+    if w is not None:
+        weights = perspective_weights(weights, w)
+    attributes = np.asarray(attributes, dtype=float).reshape(3, -1)
+    return weights.T @ attributes
+
+def _uv_derivatives(vertices, uvs, w, weights):
+    """
+    Производные текстурных координат по x и y экрана в каждом покрытом пикселе.
+    u = U / Q, где U = sum(l_i * u_i / w_i) и Q = sum(l_i / w_i) линейны по экрану,
+    поэтому du/dx = (dU/dx - u * dQ/dx) / Q.
+    """
+    v1, v2, v3 = vertices
+    grad = _edge_gradients(v1, v2, v3)
+
+    q = np.ones(3) if w is None else 1 / np.asarray(w, dtype=float).reshape(3)
+    uvq = np.asarray(uvs, dtype=float).reshape(3, 2) * q[:, None]
+    big_q = q @ weights
+    uv = (uvq.T @ weights) / big_q
+
+    dq = grad.T @ q        # (dQ/dx, dQ/dy)
+    duv = grad.T @ uvq     # [[dU/dx, dV/dx], [dU/dy, dV/dy]]
+    dudx, dvdx = (duv[0][:, None] - uv * dq[0]) / big_q
+    dudy, dvdy = (duv[1][:, None] - uv * dq[1]) / big_q
+    return dudx, dvdx, dudy, dvdy
+
+def rasterize_triangle(vertices, colors, width, height, w=None, samples=None, block=None):
+    """
+    Векторизованная растеризация треугольника с интерполяцией цвета.
+    w - координата w вершин после проекции для перспективно-корректной интерполяции,
+    samples - число подвыборок сглаживания ребер (4, 8 или 16), None - без сглаживания,
+    block - размер блока иерархического режима triangle_coverage.
+    """
+    if samples is None:
+        coverage = triangle_coverage(vertices, width, height, block)
+    else:
+        coverage = triangle_coverage_aa(np.asarray(vertices, dtype=float), width, height, samples)
+    if coverage is not None and w is not None:
+        coverage = coverage[:3] + (perspective_weights(coverage[3], w),) + coverage[4:]
+    return shade_coverage(coverage, colors, width, height)
+
+def rasterize_textured(vertices, uvs, texture, width, height, w=None, filter='bilinear', mipmap=True):
+    """
+    Растеризация треугольника с текстурой.
+    uvs - текстурные координаты вершин (3, 2), texture - raster.texture.Texture,
+    w - координата w вершин для перспективно-корректной интерполяции (None - линейная по экрану).
+    С mipmap каждый пиксель читает уровень пирамиды по размеру своего следа в текстуре,
+    поэтому уменьшенный треугольник берет тексели из маленького уровня.
+    Возвращает изображение (height, width, C) того же типа, что и текстура.
+    """
+    image = np.zeros((height, width, texture.shape[2]), dtype=texture.dtype)
+    coverage = triangle_coverage(np.asarray(vertices, dtype=float), width, height)
+    if coverage is None:
+        return image
+
+    min_x, min_y, mask, weights = coverage
+    uv = interpolate_attributes(coverage, uvs, w)
+    level = None
+    if mipmap and len(texture.levels) > 1:
+        level = texture.level_of_detail(*_uv_derivatives(np.asarray(vertices, dtype=float), uvs, w, weights))
+    values = texture.sample(uv[:, 0], uv[:, 1], filter, level)
+
+    if np.issubdtype(image.dtype, np.integer):
+        limits = np.iinfo(image.dtype)
+        values = np.clip(np.round(values), limits.min, limits.max)
+    rows, cols = mask.shape
+    image[min_y:min_y + rows, min_x:min_x + cols][mask] = values
+    return image
+
+# Треугольники с ограничивающим прямоугольником не больше этого размера
+# растеризуются пачками, более крупные - по одному
+BATCH_MAX_SIZE = 64
+# Примерное число пикселей, обрабатываемых за одну пачку
+BATCH_PIXELS = 1 << 20
+
+def _depth_test(image, zbuffer, priority_buffer, pix, z, priority, rgb):
+    """Записывает фрагменты, прошедшие тест глубины (при равной глубине побеждает меньший приоритет)"""
+    order = np.lexsort((priority, z, pix))
+    pix, z, priority, rgb = pix[order], z[order], priority[order], rgb[order]
+
+    first = np.ones(len(pix), dtype=bool)
+    first[1:] = pix[1:] != pix[:-1]
+    pix, z, priority, rgb = pix[first], z[first], priority[first], rgb[first]
+
+    zflat = zbuffer.reshape(-1)
+    pflat = priority_buffer.reshape(-1)
+    current_z = zflat[pix]
+    win = (z < current_z) | ((z == current_z) & (priority < pflat[pix]))
+
+    pix = pix[win]
+    zflat[pix] = z[win]
+    pflat[pix] = priority[win]
+    image.reshape(-1, 3)[pix] = rgb[win]
+
+def _shade(l1, l2, l3, colors):
+    """Интерполирует цвета вершин; colors имеет форму (..., 3, 3) и согласован с l1, l2, l3"""
+    rgb = np.empty(l1.shape + (3,), dtype=np.uint8)
+    for c in range(3):
+        value = l1 * colors[..., 0, c] + l2 * colors[..., 1, c] + l3 * colors[..., 2, c]
+        rgb[..., c] = value.astype(np.uint8)
+    return rgb
+
+def _rasterize_batch(vertices, colors, depth, priority, boxes, size, width):
+    """Фрагменты пачки треугольников, чьи прямоугольники помещаются в квадрат size x size"""
+    min_x, max_x, min_y, max_y = (b[:, None, None] for b in boxes.T)
+    steps = np.arange(size)
+    xs = min_x + steps[None, None, :]
+    ys = min_y + steps[None, :, None]
+
+    v1, v2, v3 = (vertices[:, i].T[:, :, None, None] for i in range(3))
+    denom = (v2[1] - v3[1]) * (v1[0] - v3[0]) + (v3[0] - v2[0]) * (v1[1] - v3[1])
+
+    px = xs - v3[0]
+    py = ys - v3[1]
+    l1 = ((v2[1] - v3[1]) * px + (v3[0] - v2[0]) * py) / denom
+    l2 = ((v3[1] - v1[1]) * px + (v1[0] - v3[0]) * py) / denom
+    l3 = 1 - l1 - l2
+
+    mask = (xs <= max_x) & (ys <= max_y) & (l1 >= 0) & (l2 >= 0) & (l3 >= 0)
+    b, j, i = np.nonzero(mask)
+
+    l1, l2, l3 = l1[b, j, i], l2[b, j, i], l3[b, j, i]
+    pix = ys[b, j, 0] * width + xs[b, 0, i]
+    z = l1 * depth[b, 0] + l2 * depth[b, 1] + l3 * depth[b, 2]
+    return pix, z, priority[b], _shade(l1, l2, l3, colors[b])
+
+def _rasterize_single(vertices, colors, depth, priority, box, width):
+    """Фрагменты одного крупного треугольника; пустые блоки прямоугольника пропускаются"""
+    min_x, max_x, min_y, max_y = box
+    v1, v2, v3 = vertices
+    mask = hierarchical_mask(v1, v2, v3, min_x, max_x, min_y, max_y)
+    j, i = np.nonzero(mask)
+    l1, l2, l3 = barycentric_points(v1, v2, v3, (i + min_x).astype(float), (j + min_y).astype(float))
+
+    pix = (j + min_y) * width + (i + min_x)
+    z = l1 * depth[0] + l2 * depth[1] + l3 * depth[2]
+    return pix, z, np.full(len(pix), priority), _shade(l1, l2, l3, colors)
+
+def _prepare_mesh(vertices, colors, depth):
+    """Проверяет входные массивы и задает глубину и приоритет отрисовки"""
+    vertices = np.asarray(vertices, dtype=float)
+    colors = np.asarray(colors)
+    n = len(vertices)
+    if vertices.shape != (n, 3, 2) or colors.shape != (n, 3, 3):
+        raise ValueError("vertices must be (N, 3, 2) and colors (N, 3, 3)")
+
+    if depth is None:
+        depth = np.zeros((n, 3))
+        priority = np.arange(n)[::-1].copy()
+    else:
+        depth = np.asarray(depth, dtype=float)
+        if depth.shape != (n, 3):
+            raise ValueError("depth must be (N, 3)")
+        priority = np.arange(n)
+
+    return vertices, colors, depth, priority
+
+def _mesh_boxes(vertices, x0, x1, y0, y1):
+    """Ограничивающие прямоугольники всех треугольников, обрезанные по области [x0, x1] x [y0, y1]"""
+    # Как и int() в bounding_box, отбрасываем дробную часть к нулю
+    lo = np.trunc(np.min(vertices, axis=1)).astype(int)
+    hi = np.trunc(np.max(vertices, axis=1)).astype(int)
+    return np.stack([np.maximum(lo[:, 0], x0), np.minimum(hi[:, 0], x1),
+                     np.maximum(lo[:, 1], y0), np.minimum(hi[:, 1], y1)], axis=1)
+
+def _render(vertices, colors, depth, priority, image, zbuffer, priority_buffer, region):
+    """Растеризует треугольники в буферы кадра, затрагивая только область region = (x0, x1, y0, y1)"""
+    if len(vertices) == 0:
+        return
+
+    width = image.shape[1]
+    boxes = _mesh_boxes(vertices, *region)
+
+    v1, v2, v3 = vertices[:, 0], vertices[:, 1], vertices[:, 2]
+    denom = (v2[:, 1] - v3[:, 1]) * (v1[:, 0] - v3[:, 0]) + (v3[:, 0] - v2[:, 0]) * (v1[:, 1] - v3[:, 1])
+    visible = (boxes[:, 0] <= boxes[:, 1]) & (boxes[:, 2] <= boxes[:, 3]) & (np.abs(denom) >= 1e-10)
+
+    extent = np.maximum(boxes[:, 1] - boxes[:, 0], boxes[:, 3] - boxes[:, 2]) + 1
+    # Группируем по размеру прямоугольника, округленному вверх до степени двойки
+    sizes = 1 << np.ceil(np.log2(np.maximum(extent, 1))).astype(int)
+
+    for size in np.unique(sizes[visible]):
+        group = np.nonzero(visible & (sizes == size))[0]
+        if size > BATCH_MAX_SIZE:
+            for t in group:
+                fragments = _rasterize_single(vertices[t], colors[t], depth[t], priority[t], boxes[t], width)
+                _depth_test(image, zbuffer, priority_buffer, *fragments)
+            continue
+
+        chunk = max(1, BATCH_PIXELS // (size * size))
+        for start in range(0, len(group), chunk):
+            t = group[start:start + chunk]
+            fragments = _rasterize_batch(vertices[t], colors[t], depth[t], priority[t], boxes[t], size, width)
+            _depth_test(image, zbuffer, priority_buffer, *fragments)
+
+def rasterize_mesh(vertices, colors, width, height, depth=None):
+    """
+    Растеризация множества треугольников в общий кадр с буфером глубины.
+    vertices - (N, 3, 2), colors - (N, 3, 3), depth - (N, 3) или None.
+    Без depth треугольники рисуются по порядку (последний сверху),
+    с depth побеждает ближайший (меньший z), при равенстве - нарисованный раньше.
+    Возвращает изображение (height, width, 3) и буфер глубины (height, width).
+    """
+    vertices, colors, depth, priority = _prepare_mesh(vertices, colors, depth)
+
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    zbuffer = np.full((height, width), np.inf)
+    priority_buffer = np.full((height, width), len(vertices))
+
+    _render(vertices, colors, depth, priority, image, zbuffer, priority_buffer,
+            (0, width - 1, 0, height - 1))
+
+    return image, zbuffer
+
+def _render_tile(task):
+    """Задача процесса-обработчика: рисует одну плитку прямо в разделяемую память"""
+    from multiprocessing import shared_memory
+
+    names, width, height, region, vertices, colors, depth, priority = task
+
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        image = np.ndarray((height, width, 3), dtype=np.uint8, buffer=blocks[0].buf)
+        zbuffer = np.ndarray((height, width), dtype=float, buffer=blocks[1].buf)
+        priority_buffer = np.ndarray((height, width), dtype=int, buffer=blocks[2].buf)
+        _render(vertices, colors, depth, priority, image, zbuffer, priority_buffer, region)
+        del image, zbuffer, priority_buffer
+    finally:
+        for block in blocks:
+            block.close()
+
+def bin_triangles(vertices, width, height, tile_size):
+    """Раскладывает треугольники по плиткам экрана: [(область плитки, индексы треугольников), ...]"""
+    boxes = _mesh_boxes(vertices, 0, width - 1, 0, height - 1)
+    bins = []
+    for y0 in range(0, height, tile_size):
+        y1 = min(y0 + tile_size, height) - 1
+        for x0 in range(0, width, tile_size):
+            x1 = min(x0 + tile_size, width) - 1
+            inside = ((boxes[:, 0] <= x1) & (boxes[:, 1] >= x0) &
+                      (boxes[:, 2] <= y1) & (boxes[:, 3] >= y0))
+            indices = np.nonzero(inside)[0]
+            if len(indices):
+                bins.append(((x0, x1, y0, y1), indices))
+    return bins
+
+def rasterize_mesh_tiled(vertices, colors, width, height, depth=None, workers=None, tile_size=256):
+    """
+    То же, что rasterize_mesh, но плитки экрана рисуются параллельно в пуле процессов.
+    Кадр и буферы лежат в разделяемой памяти, поэтому пиксели обратно не передаются.
+    Результат побитово совпадает с rasterize_mesh.
+    """
+    # Пул процессов нужен только здесь, поэтому не замедляет импорт модуля
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    vertices, colors, depth, priority = _prepare_mesh(vertices, colors, depth)
+
+    shapes = [((height, width, 3), np.uint8, 0),
+              ((height, width), float, np.inf),
+              ((height, width), int, len(vertices))]
+    blocks = []
+    try:
+        arrays = []
+        for shape, dtype, fill in shapes:
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            block = shared_memory.SharedMemory(create=True, size=size)
+            blocks.append(block)
+            array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            array.fill(fill)
+            arrays.append(array)
+
+        names = [block.name for block in blocks]
+        tasks = [(names, width, height, region,
+                  vertices[indices], colors[indices], depth[indices], priority[indices])
+                 for region, indices in bin_triangles(vertices, width, height, tile_size)]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(_render_tile, tasks):
+                pass
+
+        image, zbuffer = arrays[0].copy(), arrays[1].copy()
+        del arrays, array
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return image, zbuffer